@@ -0,0 +1,124 @@
+"""Memory benchmark: 10,000 live trials, compact TrialStore vs legacy dicts.
+
+Each trial holds 6 rounds of plaintiff/defendant arguments and 6 judge
+evaluations with their reasoning. Two workloads are measured:
+
+  template  arguments and reasonings come from the ~300 character
+            template tables
+  openclaw  every argument is a fresh, unique ~600 character text and
+            every reasoning a unique ~300 character one
+
+The legacy model is what clients sent back on every call: a dict of
+argument lists and evaluation dicts, with strings as json.loads builds
+them (one copy per trial). Footprint is measured with tracemalloc.
+
+    python bench_trials.py [trials]
+"""
+import json
+import random
+import sys
+import tracemalloc
+
+from court_trials import CRITERIA, JUDGES, ArgumentTable, TrialStore
+
+ROUNDS = 6
+TEMPLATES_PER_ROUND = 3
+
+random.seed(7)
+WORDS = ('blockchain timestamp exploit audit research evidence disclosure commit '
+         'vulnerability defendant plaintiff timeline independent proof contract').split()
+
+
+def text(chars):
+    return ' '.join(random.choices(WORDS, k=chars // 9))
+
+
+TEMPLATES = {
+    role: {n: [text(300) for _ in range(TEMPLATES_PER_ROUND)] for n in range(1, ROUNDS + 1)}
+    for role in ('plaintiff', 'defendant')
+}
+REASONINGS = {judge: [text(300) for _ in range(2 * TEMPLATES_PER_ROUND)] for judge in JUDGES}
+
+
+def arguments(workload):
+    """(role, text) pairs for one trial, in the order they were argued"""
+    for n in range(1, ROUNDS + 1):
+        for role in ('plaintiff', 'defendant'):
+            if workload == 'template':
+                yield role, random.choice(TEMPLATES[role][n])
+            else:
+                yield role, text(600)
+
+
+def scores():
+    return {c: random.randint(65, 95) for c in CRITERIA}
+
+
+def evaluations(workload):
+    """(judge, evaluation) pairs for one trial"""
+    for judge in JUDGES:
+        p, d = scores(), scores()
+        p['total'] = sum(p.values()) // len(CRITERIA)
+        d['total'] = sum(d.values()) // len(CRITERIA)
+        reasoning = random.choice(REASONINGS[judge]) if workload == 'template' else text(300)
+        yield judge, {
+            'plaintiff': p,
+            'defendant': d,
+            'reasoning': json.loads(json.dumps(reasoning)),
+            'winner': 'plaintiff' if p['total'] > d['total'] else 'defendant',
+        }
+
+
+def legacy_trials(count, workload):
+    trials = []
+    for i in range(count):
+        trial = {'caseData': {'case_id': f'CASE-{i}'}, 'plaintiffArgs': [], 'defendantArgs': [], 'evaluations': []}
+        for role, arg in arguments(workload):
+            # Every request re-parsed the history, so each trial had its own copies
+            trial[f'{role}Args'].append(json.loads(json.dumps(arg)))
+        for judge, evaluation in evaluations(workload):
+            trial['evaluations'].append({'judge': judge, **evaluation})
+        trials.append(trial)
+    return trials
+
+
+def compact_trials(count, workload, table):
+    store = TrialStore(table, max_trials=count)
+    for i in range(count):
+        trial = store.create(f'CASE-{i}')
+        for role, arg in arguments(workload):
+            store.add_argument(trial, role, json.loads(json.dumps(arg)))
+        for judge, evaluation in evaluations(workload):
+            store.add_evaluation(trial, judge, evaluation)
+    return store
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del held
+    return used
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"{count} trials, {ROUNDS} rounds x 2 arguments + {len(JUDGES)} judge evaluations each\n")
+    print(f"{'workload':<10} {'model':<8} {'total MB':>9} {'bytes/trial':>12}")
+    for workload in ('template', 'openclaw'):
+        # Template texts are preloaded, as the servers do with their tables
+        table = ArgumentTable([t for side in TEMPLATES.values() for r in side.values() for t in r]
+                              + [t for texts in REASONINGS.values() for t in texts] + JUDGES)
+        results = [
+            ('legacy', measure(lambda: legacy_trials(count, workload))),
+            ('compact', measure(lambda: compact_trials(count, workload, table))),
+        ]
+        for model, used in results:
+            print(f"{workload:<10} {model:<8} {used / 1e6:>9.1f} {used // count:>12}")
+        print(f"{'':<10} {'saving':<8} {1 - results[1][1] / results[0][1]:>9.0%}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""Batched event indexer for contracts/AgentCourt.sol.
+
+Pulls the contract's logs over JSON-RPC (eth_getLogs) in block-range
+batches, fetching several ranges in parallel, decodes them and stores
+them in a local SQLite index that the court API can query without any
+per-case RPC calls.
+
+Progress is checkpointed after every range, so a restart resumes where
+it stopped. Block hashes of recently indexed blocks are kept; when the
+chain no longer agrees with them the indexer rolls back to the newest
+block it still agrees with and re-indexes from there (reorg handling).
+
+Configuration comes from the environment (see .env.example):
+    RPC_URL, CONTRACT_ADDRESS, INDEX_START_BLOCK, CHAIN_INDEX_DB
+
+Without INDEX_START_BLOCK the indexer starts at the contract's deployment
+block, found by bisecting eth_getCode. Only errors saying a range is too
+large (or returns too many logs) split the range; rate limits and other
+node errors are retried with exponential backoff.
+
+Any object with a call(method, params) method can stand in for RpcClient,
+so the indexer runs against a local dev chain (anvil) or a ReplayRpc
+loaded from a recorded session.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BATCH_BLOCKS = 2000
+PARALLEL_RANGES = 4
+CONFIRMATIONS = 2
+BLOCK_HASH_HISTORY = 64
+POLL_SECONDS = 5
+RPC_RETRIES = 4
+RETRY_DELAY = 1.0
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'chain_index.sqlite3')
+
+# ============ Keccak-256 (event topics) ============
+
+_RC = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+_ROT = [
+    [0, 36, 3, 41, 18],
+    [1, 44, 10, 45, 2],
+    [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56],
+    [27, 20, 39, 8, 14],
+]
+_MASK = (1 << 64) - 1
+
+
+def _rotl(v, n):
+    return ((v << n) | (v >> (64 - n))) & _MASK if n else v
+
+
+def _keccak_f(a):
+    for rc in _RC:
+        c = [a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ _rotl(c[(x + 1) % 5], 1) for x in range(5)]
+        a = [a[i] ^ d[i % 5] for i in range(25)]
+        b = [0] * 25
+        for x in range(5):
+            for y in range(5):
+                b[y + 5 * ((2 * x + 3 * y) % 5)] = _rotl(a[x + 5 * y], _ROT[x][y])
+        a = [b[i] ^ (~b[(i % 5 + 1) % 5 + 5 * (i // 5)] & b[(i % 5 + 2) % 5 + 5 * (i // 5)]) for i in range(25)]
+        a[0] ^= rc
+    return a
+
+
+def keccak256(data):
+    """Ethereum's Keccak-256 (not NIST SHA3-256, which hashlib provides)"""
+    rate = 136
+    padded = bytearray(data) + b'\x01'
+    padded += b'\x00' * (-len(padded) % rate)
+    padded[-1] |= 0x80
+    state = [0] * 25
+    for off in range(0, len(padded), rate):
+        for i in range(rate // 8):
+            state[i] ^= int.from_bytes(padded[off + 8 * i:off + 8 * i + 8], 'little')
+        state = _keccak_f(state)
+    return b''.join(state[i].to_bytes(8, 'little') for i in range(4))
+
+# ============ AgentCourt events ============
+
+# name -> [(arg, abi type, indexed)]; enums are uint8 in the ABI
+EVENTS = {
+    'AgentRegistered': [('agent', 'address', True), ('level', 'uint8', False)],
+    'CaseReported': [('caseId', 'uint256', True), ('defendant', 'address', True), ('reporter', 'address', True)],
+    'CaseJudged': [('caseId', 'uint256', True), ('verdict', 'uint8', False), ('confidence', 'uint8', False)],
+    'JuryVoted': [('caseId', 'uint256', True), ('juror', 'address', True), ('vote', 'uint8', False)],
+    'CaseExecuted': [('caseId', 'uint256', True), ('punishment', 'uint8', False)],
+    'AppealFiled': [('appealId', 'uint256', True), ('caseId', 'uint256', True), ('appellant', 'address', False)],
+    'AppealResolved': [('appealId', 'uint256', True), ('successful', 'bool', False)],
+    'PunishmentApplied': [('agent', 'address', True), ('punishment', 'uint8', False), ('caseId', 'uint256', False)],
+    'ArgumentSubmitted': [('caseId', 'uint256', True), ('submitter', 'address', True), ('isPlaintiff', 'bool', False), ('round', 'uint256', False)],
+}
+
+# Enum labels, mirroring the contract's declaration order
+ENUMS = {
+    'level': ['Citizen', 'Reporter', 'Judge', 'Juror', 'Executor', 'Appeal', 'Supreme'],
+    'verdict': ['Safe', 'Spam', 'Abuse', 'Malicious'],
+    'vote': ['NotVoted', 'Guilty', 'NotGuilty', 'Escalate'],
+    'punishment': ['None', 'Warning', 'TempBan', 'Isolation', 'RateLimit', 'RepReduction'],
+}
+
+TOPICS = {
+    '0x' + keccak256(f"{name}({','.join(t for _, t, _ in args)})".encode()).hex(): name
+    for name, args in EVENTS.items()
+}
+
+
+def _decode_word(word, abi_type):
+    value = int(word, 16)
+    if abi_type == 'address':
+        return '0x' + word[-40:].lower()
+    if abi_type == 'bool':
+        return bool(value)
+    return value
+
+
+def decode_log(log):
+    """Decode one eth_getLogs entry into a flat event dict, or None if it isn't ours"""
+    topics = log.get('topics') or []
+    name = TOPICS.get(topics[0].lower()) if topics else None
+    if not name:
+        return None
+    data = (log.get('data') or '0x')[2:]
+    words = [data[i:i + 64] for i in range(0, len(data), 64)]
+    indexed = iter(t[2:] for t in topics[1:])
+    args = {}
+    for arg, abi_type, is_indexed in EVENTS[name]:
+        value = _decode_word(next(indexed) if is_indexed else words.pop(0), abi_type)
+        if arg in ENUMS:
+            labels = ENUMS[arg]
+            value = labels[value] if value < len(labels) else value
+        args[arg] = value
+    return {
+        'event': name,
+        'block_number': int(log['blockNumber'], 16),
+        'block_hash': log['blockHash'],
+        'tx_hash': log['transactionHash'],
+        'log_index': int(log['logIndex'], 16),
+        'args': args,
+    }
+
+# ============ JSON-RPC ============
+
+
+class RpcError(Exception):
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+# How nodes word "this eth_getLogs range is too big" - the only errors worth splitting on
+_RANGE_TOO_LARGE = re.compile(
+    r'block range|range (is )?too (large|wide|big)|exceed(s|ed)? (the )?max(imum)? (block )?range'
+    r'|more than \d+ (results|logs)|too many (results|logs|blocks)|(response|result) size|log response size',
+    re.IGNORECASE)
+
+
+def range_too_large(error):
+    return isinstance(error, RpcError) and bool(_RANGE_TOO_LARGE.search(str(error)))
+
+
+class RpcClient:
+    """Minimal JSON-RPC client; optionally records every call for ReplayRpc"""
+
+    def __init__(self, url, timeout=30, record_to=None):
+        self.url = url
+        self.timeout = timeout
+        self.record_to = record_to
+        self._recorded = []
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def call(self, method, params):
+        with self._lock:
+            self._ids += 1
+            request_id = self._ids
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            reply = json.loads(response.read().decode())
+        if 'error' in reply:
+            raise RpcError(reply['error'].get('message', str(reply['error'])), reply['error'].get('code'))
+        if self.record_to:
+            with self._lock:
+                self._recorded.append({'method': method, 'params': params, 'result': reply['result']})
+                with open(self.record_to, 'w') as f:
+                    json.dump(self._recorded, f, indent=2)
+        return reply['result']
+
+
+class ReplayRpc:
+    """Serves calls from a recording made with RpcClient(record_to=...)"""
+
+    def __init__(self, path_or_calls):
+        if isinstance(path_or_calls, str):
+            with open(path_or_calls) as f:
+                path_or_calls = json.load(f)
+        self._results = {}
+        for entry in path_or_calls:
+            # Later recordings of the same call win (e.g. eth_blockNumber over time)
+            self._results[self._key(entry['method'], entry['params'])] = entry['result']
+
+    @staticmethod
+    def _key(method, params):
+        return method, json.dumps(params, sort_keys=True)
+
+    def call(self, method, params):
+        key = self._key(method, params)
+        if key not in self._results:
+            raise RpcError(f'No recorded result for {method} {params}')
+        return self._results[key]
+
+# ============ Store ============
+
+
+class EventStore:
+    """SQLite index of decoded events plus the indexer checkpoint"""
+
+    def __init__(self, path=DEFAULT_DB):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS events (
+                    block_number INTEGER NOT NULL,
+                    log_index INTEGER NOT NULL,
+                    block_hash TEXT NOT NULL,
+                    tx_hash TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    case_id INTEGER,
+                    agent TEXT,
+                    args TEXT NOT NULL,
+                    PRIMARY KEY (block_number, log_index)
+                );
+                CREATE INDEX IF NOT EXISTS events_case ON events (case_id, block_number, log_index);
+                CREATE INDEX IF NOT EXISTS events_agent ON events (agent, block_number, log_index);
+                CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS checkpoint (contract TEXT PRIMARY KEY, block_number INTEGER NOT NULL);
+            ''')
+
+    def checkpoint(self, contract):
+        with self._lock:
+            row = self._db.execute('SELECT block_number FROM checkpoint WHERE contract = ?', (contract,)).fetchone()
+        return row[0] if row else None
+
+    def write_range(self, contract, events, to_block, to_hash):
+        """Store one range's events and advance the checkpoint atomically"""
+        rows = []
+        for e in events:
+            args = e['args']
+            agent = args.get('defendant') or args.get('agent') or args.get('juror') or args.get('submitter') or args.get('appellant')
+            rows.append((e['block_number'], e['log_index'], e['block_hash'], e['tx_hash'], e['event'],
+                         args.get('caseId'), agent, json.dumps(args)))
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            blocks = {(e['block_number'], e['block_hash']) for e in events} | {(to_block, to_hash)}
+            self._db.executemany('INSERT OR REPLACE INTO blocks VALUES (?, ?)', blocks)
+            self._db.execute('DELETE FROM blocks WHERE number NOT IN '
+                             '(SELECT number FROM blocks ORDER BY number DESC LIMIT ?)', (BLOCK_HASH_HISTORY,))
+            self._db.execute('INSERT OR REPLACE INTO checkpoint VALUES (?, ?)', (contract, to_block))
+
+    def recent_blocks(self):
+        """Known (number, hash) pairs, newest first"""
+        with self._lock:
+            return [tuple(r) for r in self._db.execute('SELECT number, hash FROM blocks ORDER BY number DESC')]
+
+    def rollback(self, contract, block_number):
+        """Drop everything after block_number (a reorg replaced it)"""
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM events WHERE block_number > ?', (block_number,))
+            self._db.execute('DELETE FROM blocks WHERE number > ?', (block_number,))
+            self._db.execute('INSERT OR REPLACE INTO checkpoint VALUES (?, ?)', (contract, block_number))
+
+    def _rows(self, sql, params):
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [{
+            'event': r['event'],
+            'block_number': r['block_number'],
+            'log_index': r['log_index'],
+            'tx_hash': r['tx_hash'],
+            'args': json.loads(r['args']),
+        } for r in rows]
+
+    def case_events(self, case_id):
+        return self._rows('SELECT * FROM events WHERE case_id = ? ORDER BY block_number, log_index', (int(case_id),))
+
+    def agent_events(self, agent, limit=100):
+        return self._rows('SELECT * FROM events WHERE agent = ? ORDER BY block_number DESC, log_index DESC LIMIT ?',
+                          (agent.lower(), limit))
+
+    def recent_events(self, limit=50):
+        return self._rows('SELECT * FROM events ORDER BY block_number DESC, log_index DESC LIMIT ?', (limit,))
+
+    def case_state(self, case_id):
+        """Fold a case's events into its current on-chain lifecycle state"""
+        events = self.case_events(case_id)
+        if not events:
+            return None
+        state = {'case_id': int(case_id), 'status': None, 'arguments': [], 'jury_votes': {}, 'appeals': []}
+        for e in events:
+            args = e['args']
+            if e['event'] == 'CaseReported':
+                state.update(status='Open', defendant=args['defendant'], reporter=args['reporter'],
+                             reported_block=e['block_number'])
+            elif e['event'] == 'ArgumentSubmitted':
+                state['arguments'].append({'submitter': args['submitter'], 'isPlaintiff': args['isPlaintiff'],
+                                           'round': args['round'], 'block_number': e['block_number']})
+            elif e['event'] == 'CaseJudged':
+                state.update(status='Judged', verdict=args['verdict'], confidence=args['confidence'])
+            elif e['event'] == 'JuryVoted':
+                state['status'] = 'JuryVoting'
+                state['jury_votes'][args['juror']] = args['vote']
+            elif e['event'] == 'CaseExecuted':
+                state.update(status='Executed', punishment=args['punishment'])
+            elif e['event'] == 'AppealFiled':
+                state['status'] = 'Appealed'
+                state['appeals'].append({'appeal_id': args['appealId'], 'appellant': args['appellant']})
+        state['last_block'] = events[-1]['block_number']
+        return state
+
+# ============ Indexer ============
+
+
+class ChainIndexer:
+    def __init__(self, rpc, store, contract, start_block=None, batch_blocks=BATCH_BLOCKS,
+                 parallel=PARALLEL_RANGES, confirmations=CONFIRMATIONS, retries=RPC_RETRIES,
+                 retry_delay=RETRY_DELAY):
+        """start_block None means the contract's deployment block (looked up when first needed)"""
+        self.rpc = rpc
+        self.store = store
+        self.contract = contract.lower()
+        self._start_block = start_block
+        self.batch_blocks = batch_blocks
+        self.parallel = parallel
+        self.confirmations = confirmations
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    def _call(self, method, params):
+        """rpc.call, retrying rate limits and transient failures with exponential backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                return self.rpc.call(method, params)
+            except (RpcError, OSError) as e:
+                # A too-large range won't succeed on retry; the caller splits it
+                if range_too_large(e) or attempt == self.retries:
+                    raise
+                delay = self.retry_delay * 2 ** attempt
+                print(f"RPC {method} failed ({e}); retrying in {delay:g}s")
+                time.sleep(delay)
+
+    @property
+    def start_block(self):
+        if self._start_block is None:
+            self._start_block = self.deployment_block()
+            print(f"{self.contract} deployed at block {self._start_block}")
+        return self._start_block
+
+    def deployment_block(self):
+        """First block at which the contract has code (bisection over eth_getCode)"""
+        lo, hi = 0, int(self._call('eth_blockNumber', []), 16)
+        if self._call('eth_getCode', [self.contract, hex(hi)]) in (None, '0x'):
+            raise RpcError(f'No contract code at {self.contract}')
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._call('eth_getCode', [self.contract, hex(mid)]) in (None, '0x'):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _block_hash(self, number):
+        block = self._call('eth_getBlockByNumber', [hex(number), False])
+        return block['hash'] if block else None
+
+    def _fetch(self, from_block, to_block):
+        """Logs for one range, halving the range when the node refuses it as too large"""
+        try:
+            logs = self._call('eth_getLogs', [{
+                'address': self.contract,
+                'fromBlock': hex(from_block),
+                'toBlock': hex(to_block),
+            }])
+        except RpcError as e:
+            if from_block == to_block or not range_too_large(e):
+                raise
+            mid = (from_block + to_block) // 2
+            return self._fetch(from_block, mid) + self._fetch(mid + 1, to_block)
+        # removed marks logs dropped by a reorg; decode_log doesn't carry it over
+        events = [e for e in (decode_log(log) for log in logs if not log.get('removed')) if e]
+        events.sort(key=lambda e: (e['block_number'], e['log_index']))
+        return events
+
+    def check_reorg(self):
+        """Roll back to the newest stored block the chain still agrees with.
+
+        Returns the block rolled back to, or None when nothing changed.
+        """
+        known = self.store.recent_blocks()
+        for i, (number, block_hash) in enumerate(known):
+            if self._block_hash(number) == block_hash:
+                if i == 0:
+                    return None
+                print(f"Reorg detected: rolling back to block {number}")
+                self.store.rollback(self.contract, number)
+                return number
+        if known:
+            # Older than any hash we kept: re-index from scratch
+            number = self.start_block - 1
+            print(f"Deep reorg detected: re-indexing from block {self.start_block}")
+            self.store.rollback(self.contract, number)
+            return number
+        return None
+
+    def sync(self):
+        """Index every confirmed block not yet indexed; returns the number of events stored"""
+        self.check_reorg()
+        head = int(self._call('eth_blockNumber', []), 16) - self.confirmations
+        done = self.store.checkpoint(self.contract)
+        start = self.start_block if done is None else done + 1
+        if start > head:
+            return 0
+
+        ranges = [(lo, min(lo + self.batch_blocks - 1, head)) for lo in range(start, head + 1, self.batch_blocks)]
+        stored = 0
+        with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            # Fetch in parallel, but commit strictly in order so the checkpoint never skips a range
+            for (lo, hi), events in zip(ranges, pool.map(lambda r: self._fetch(*r), ranges)):
+                self.store.write_range(self.contract, events, hi, self._block_hash(hi))
+                stored += len(events)
+        return stored
+
+    def follow(self, poll_seconds=POLL_SECONDS, stop=None):
+        """Keep syncing until stop (a threading.Event) is set"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                stored = self.sync()
+                if stored:
+                    print(f"Indexed {stored} AgentCourt events")
+            except Exception as e:
+                print(f"Chain indexer error: {e}")
+            stop.wait(poll_seconds)
+
+
+def from_env(store=None):
+    """Indexer configured from RPC_URL / CONTRACT_ADDRESS / INDEX_START_BLOCK / CHAIN_INDEX_DB"""
+    return ChainIndexer(
+        RpcClient(os.environ.get('RPC_URL', 'https://rpc.monad.xyz')),
+        store or EventStore(os.environ.get('CHAIN_INDEX_DB', DEFAULT_DB)),
+        os.environ.get('CONTRACT_ADDRESS', '0xb64f18c9EcD475ECF3aac84B11B3774fccFe5458'),
+        start_block=int(os.environ['INDEX_START_BLOCK']) if os.environ.get('INDEX_START_BLOCK') else None,
+    )
+
+
+if __name__ == '__main__':
+    indexer = from_env()
+    checkpoint = indexer.store.checkpoint(indexer.contract)
+    print(f'Indexing {indexer.contract} from block {indexer.start_block if checkpoint is None else checkpoint + 1}')
+    indexer.follow()
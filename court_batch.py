@@ -0,0 +1,129 @@
+"""Batch execution of court operations for /api/batch.
+
+Both servers hand run_batch() a dispatch function that maps a single
+operation (path + body) to its JSON response, so a batch behaves exactly
+like the equivalent sequence of individual POSTs.
+"""
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from court_cases import BULK_MAX
+
+# Operations a batch may contain - auth routes are deliberately excluded
+BATCHABLE_PATHS = (
+    '/api/generate-argument',
+    '/api/judge-evaluation',
+    '/api/generate-case',
+)
+MAX_BATCH_OPERATIONS = 50
+# Cases a whole batch may generate, counting bulk {"count": N} operations as N
+MAX_BATCH_CASES = 50
+MAX_BATCH_CONCURRENCY = 8
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+class SharedWork:
+    """Per-batch memo so operations doing identical work only pay for it once"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}
+        self._results = {}
+
+    def get(self, key, compute):
+        """Return compute() for key, running it at most once per batch.
+
+        Concurrent callers with the same key wait for the first caller
+        instead of repeating the work. Exceptions are cached too, so a
+        failing OpenClaw call is not retried by every operation sharing it.
+        """
+        with self._lock:
+            event = self._events.get(key)
+            owner = event is None
+            if owner:
+                event = self._events[key] = threading.Event()
+        if owner:
+            try:
+                self._results[key] = (True, compute())
+            except Exception as e:
+                self._results[key] = (False, e)
+            finally:
+                event.set()
+        else:
+            event.wait()
+        ok, value = self._results[key]
+        if not ok:
+            raise value
+        return value
+
+
+def requested_cases(operations):
+    """Total cases the generate-case operations of a batch ask for (each capped like a single call)"""
+    total = 0
+    for op in operations:
+        if not isinstance(op, dict) or op.get('path') != '/api/generate-case':
+            continue
+        body = op.get('body')
+        try:
+            total += max(1, min(int(body.get('count', 1)), BULK_MAX)) if isinstance(body, dict) else 1
+        except (TypeError, ValueError):
+            # The operation itself rejects a bad count
+            total += 1
+    return total
+
+
+def parse_batch(data):
+    """Validate a batch body, returning (operations, concurrency) or raising ValueError"""
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        raise ValueError('operations must be a non-empty list')
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f'at most {MAX_BATCH_OPERATIONS} operations per batch')
+    if requested_cases(operations) > MAX_BATCH_CASES:
+        raise ValueError(f'at most {MAX_BATCH_CASES} generated cases per batch')
+    try:
+        concurrency = int(data.get('concurrency', DEFAULT_BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        raise ValueError('concurrency must be an integer')
+    concurrency = max(1, min(concurrency, MAX_BATCH_CONCURRENCY, len(operations)))
+    return operations, concurrency
+
+
+def run_batch(data, dispatch):
+    """Run every operation in a batch body and return the /api/batch response.
+
+    dispatch(path, body, shared) performs one operation and returns its
+    JSON-able response. Results come back in request order; one failing
+    operation never fails the whole batch.
+    """
+    operations, concurrency = parse_batch(data)
+    shared = SharedWork()
+
+    def run_one(index, op):
+        if not isinstance(op, dict):
+            return {'index': index, 'success': False, 'error': 'operation must be an object'}
+        path = op.get('path')
+        if path not in BATCHABLE_PATHS:
+            return {'index': index, 'path': path, 'success': False, 'error': f'unsupported path: {path}'}
+        body = op.get('body') or {}
+        if not isinstance(body, dict):
+            return {'index': index, 'path': path, 'success': False, 'error': 'body must be an object'}
+        try:
+            result = dispatch(path, body, shared)
+        except Exception as e:
+            print(f"Batch operation {index} ({path}) failed: {e}")
+            traceback.print_exc()
+            return {'index': index, 'path': path, 'success': False, 'error': str(e)}
+        return {'index': index, 'path': path, 'success': bool(result.get('success', True)), 'result': result}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_one, i, op) for i, op in enumerate(operations)]
+        results = [f.result() for f in futures]
+
+    return {
+        'success': True,
+        'count': len(results),
+        'failed': sum(1 for r in results if not r['success']),
+        'results': results,
+    }
@@ -0,0 +1,256 @@
+"""Case generation shared by both servers: ids, templates, bulk mode and a ready queue.
+
+Case ids come from CaseIdAllocator instead of random.randint(1000, 9999),
+which only has 9,000 values. Ids are CASE-<ms timestamp base36>-<node>:
+strictly increasing within a process, and the random per-process node
+tag keeps two servers (or a restarted one) from handing out the same id.
+
+Bulk generation runs OpenClaw for several cases in parallel, falls back
+to varied templates, and drops cases whose summary nearly repeats another
+in the same request. Summaries handed out recently are avoided too, but
+only while a fresh template can still replace them.
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from court_uniqueness import UniquenessIndex
+
+BULK_MAX = 50
+BULK_CONCURRENCY = 4
+SUMMARY_ATTEMPTS = 4
+RECENT_SUMMARIES = 200
+# Summaries share their template wording, so only ones matching in all but
+# about one slot (protocol, venue, case type) count as repeats; random
+# template pairs stay below 0.5 in 99% of cases
+SUMMARY_THRESHOLD = 0.7
+
+CASE_TYPES = [
+    'Security vulnerability discovery dispute',
+    'Smart contract audit attribution conflict',
+    'DeFi protocol exploit research theft',
+    'NFT metadata manipulation accusation',
+    'DAO governance proposal plagiarism',
+    'Cross-chain bridge vulnerability claim',
+    'MEV bot strategy theft allegation',
+    'Validator slashing evidence dispute'
+]
+
+TEMPLATE_PARTIES = [
+    ('SecurityResearcher_0x', 'BugBountyHunter_'),
+    ('DeFiAnalyst_', 'WhiteHat_'),
+    ('MEVSearcher_', 'Validator_'),
+    ('Auditor_', 'ProtocolDev_'),
+    ('NFTArtist_', 'Collector_'),
+    ('DAODelegate_', 'GovernanceWhale_')
+]
+TEMPLATE_ALLEGATIONS = [
+    'claims the defendant copied their unpublished research',
+    'says the defendant front-ran their disclosure to collect the reward',
+    'accuses the defendant of publishing their findings without attribution',
+    'alleges the defendant reused their proof-of-concept exploit line for line',
+    'argues the defendant read their private report before submitting',
+    'disputes who reported the issue to the protocol team first',
+    'claims the defendant leaked their findings to a competing team',
+    'says the defendant submitted a lightly reworded copy of their report',
+    'alleges the defendant took credit for a jointly found bug'
+]
+TEMPLATE_VENUES = [
+    'during the {protocol} audit contest',
+    'in the {protocol} bug bounty program',
+    'after the {protocol} mainnet launch',
+    'while reviewing the {protocol} v2 upgrade',
+    'in a private disclosure to {protocol}',
+    'ahead of the {protocol} governance vote'
+]
+TEMPLATE_PROTOCOLS = [
+    'MonadSwap', 'NadLend', 'ParallelBridge', 'KuruDEX', 'aPriori', 'Magma',
+    'LeverUp', 'Fastlane', 'Kintsu', 'Curvance', 'Ambient', 'NadFun'
+]
+TEMPLATE_EVIDENCE = [
+    'blockchain timestamps, research logs',
+    'on-chain transactions, audit reports',
+    'transaction patterns, mempool data',
+    'git commits, disclosure emails',
+    'signed messages, bounty platform records',
+    'IPFS pins, contract deployment history'
+]
+
+# Summaries handed out recently, so consecutive requests don't repeat themselves
+SUMMARIES = UniquenessIndex(max_recent=RECENT_SUMMARIES, threshold=SUMMARY_THRESHOLD)
+
+# Party tags (SecurityResearcher_0x3f2a) and amounts ($48,213, 120 ETH, 25K)
+_PARTY_TAG = re.compile(r'_(?:0x)?[0-9a-fA-F]+\b')
+_AMOUNT = re.compile(r'\$?\d[\d,.]*[KkMm]?\b')
+
+_BASE36 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _base36(n):
+    out = ''
+    while True:
+        n, r = divmod(n, 36)
+        out = _BASE36[r] + out
+        if not n:
+            return out
+
+
+class CaseIdAllocator:
+    """Collision-free case ids: CASE-<ms since epoch, base36>-<node>"""
+
+    def __init__(self, prefix='CASE', node=None):
+        self.prefix = prefix
+        self.node = node or _base36(int.from_bytes(os.urandom(4), 'big') ^ os.getpid()).rjust(4, '0')[-4:]
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            # Never repeat or go backwards, even within one millisecond
+            self._last = max(int(time.time() * 1000), self._last + 1)
+            return f"{self.prefix}-{_base36(self._last)}-{self.node}"
+
+
+def summary_key(summary):
+    """A summary with party tags and amounts stripped, as compared for repeats"""
+    return _AMOUNT.sub('#', _PARTY_TAG.sub('_', summary))
+
+
+def _hex_tag():
+    return ''.join(random.choice('0123456789abcdef') for _ in range(4))
+
+
+def template_case():
+    """A random case built from the template tables (no id yet)"""
+    case_type = random.choice(CASE_TYPES)
+    plaintiff, defendant = random.choice(TEMPLATE_PARTIES)
+    stakes = random.choice([
+        f'${random.randint(10000, 100000)} bug bounty',
+        f'${random.randint(50000, 500000)} protocol reward',
+        f'{random.randint(50, 500)} ETH in profits',
+        f'{random.randint(5, 50)}K governance tokens'
+    ])
+    plaintiff += _hex_tag()
+    defendant += _hex_tag()
+    venue = random.choice(TEMPLATE_VENUES).format(protocol=random.choice(TEMPLATE_PROTOCOLS))
+    return {
+        'case_type': case_type,
+        'plaintiff': plaintiff,
+        'defendant': defendant,
+        'summary': f"{case_type} {venue}: {plaintiff} {random.choice(TEMPLATE_ALLEGATIONS)}, "
+                   f"with {stakes} at stake.",
+        'evidence_type': random.choice(TEMPLATE_EVIDENCE),
+        'stakes': stakes
+    }
+
+
+def openclaw_case(run):
+    """Ask OpenClaw for a case; run(session_id, prompt) returns its output or None"""
+    case_type = random.choice(CASE_TYPES)
+    prompt = f"""Generate a unique blockchain dispute case for Agent Court.
+
+Case Type: {case_type}
+
+Create a JSON object with:
+- plaintiff: username/name of accuser
+- defendant: username/name of accused
+- summary: 1-2 sentence description of the dispute
+- evidence_type: what evidence exists (timestamps, logs, contracts, etc.)
+- stakes: what's at stake (bounty amount, reputation, tokens)
+
+Return ONLY valid JSON:
+{{
+  "plaintiff": "CryptoResearcher",
+  "defendant": "BugHunterX",
+  "summary": "Dispute over who discovered critical vulnerability first",
+  "evidence_type": "blockchain timestamps, git commits",
+  "stakes": "$50,000 bug bounty"
+}}"""
+    output = run(f"case_{int(time.time())}_{random.randint(1, 100000)}", prompt)
+    json_match = re.search(r'\{.*\}', output.strip(), re.DOTALL) if output else None
+    if not json_match:
+        return None
+    case_data = json.loads(json_match.group())
+    case_data['case_type'] = case_type
+    return case_data
+
+
+def generate_cases(count, make_case, ids):
+    """Generate up to count distinct cases in parallel.
+
+    make_case() returns (case, source) and is expected to try OpenClaw
+    and fall back to a template itself. A case whose summary nearly
+    repeats a recent one, party tags and amounts aside, is replaced by a
+    fresh template; the last of SUMMARY_ATTEMPTS only has to differ from
+    the rest of this request.
+    Cases that still collide are dropped, so fewer than count can come
+    back. Returns (cases, dropped); each case carries its 'source'.
+    """
+    request = object()
+
+    def one(_):
+        case, source = make_case()
+        for attempt in range(SUMMARY_ATTEMPTS):
+            cross_request = attempt < SUMMARY_ATTEMPTS - 1
+            if SUMMARIES.claim(summary_key(str(case.get('summary', ''))), request, cross_request):
+                case['case_id'] = ids.next()
+                case['source'] = source
+                return case
+            case, source = template_case(), 'random_fallback'
+        return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(BULK_CONCURRENCY, count)) as pool:
+            results = list(pool.map(one, range(count)))
+    finally:
+        SUMMARIES.reset_trial(request)
+    cases = [c for c in results if c]
+    return cases, len(results) - len(cases)
+
+
+class CaseQueue:
+    """Pre-generated cases ready to serve, refilled in the background"""
+
+    def __init__(self, make_case, ids, target):
+        self.make_case = make_case
+        self.ids = ids
+        self.target = target
+        self._cases = deque()
+        self._lock = threading.Lock()
+        self._filling = False
+
+    def take(self):
+        """Pop a ready case (or None) and top the queue back up"""
+        with self._lock:
+            case = self._cases.popleft() if self._cases else None
+        self.refill()
+        return case
+
+    def refill(self):
+        with self._lock:
+            missing = self.target - len(self._cases)
+            if missing <= 0 or self._filling:
+                return
+            self._filling = True
+        threading.Thread(target=self._fill, args=(missing,), daemon=True).start()
+
+    def _fill(self, missing):
+        try:
+            # Top up again after a short fill, as long as each round adds something
+            while missing > 0:
+                cases, _ = generate_cases(min(missing, BULK_MAX), self.make_case, self.ids)
+                with self._lock:
+                    self._cases.extend(cases)
+                    missing = self.target - len(self._cases)
+                if not cases:
+                    break
+        except Exception as e:
+            print(f"Case queue refill failed: {e}")
+        finally:
+            with self._lock:
+                self._filling = False
@@ -0,0 +1,185 @@
+"""Hedged OpenClaw calls with a hard deadline.
+
+OpenClaw latency has a long tail, so instead of letting one stuck call
+run into its full timeout:
+
+  * if the first attempt hasn't answered by the hedge delay (a percentile
+    of recent latencies), a second attempt starts in parallel and
+    whichever answers first wins. Attempts killed at the hard deadline
+    are sampled at the deadline (censored), so a slow spell raises the
+    delay instead of going unseen. The delay never exceeds half the hard
+    deadline, leaving a hedge time to answer;
+  * once the hard deadline passes, every outstanding attempt is killed
+    and the caller gets None straight away so it can use its template
+    answer.
+
+Configuration (environment):
+    OPENCLAW_HEDGE_PERCENTILE  latency percentile used as hedge delay (90)
+    OPENCLAW_HEDGE_DELAY       hedge delay in seconds until enough samples exist (8,
+                               capped at half the hard deadline)
+    OPENCLAW_HARD_DEADLINE     seconds before giving up on all attempts (20)
+    OPENCLAW_MAX_PROCESSES     OpenClaw subprocesses allowed at once, process-wide (8)
+
+The process cap holds however calls are nested (batches running bulk case
+generation, hedges): a primary attempt waits for a free slot until its
+deadline, and a hedge is skipped when no slot is free.
+"""
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+MIN_SAMPLES = 20
+MIN_HEDGE_DELAY = 1.0
+MAX_HEDGE_FRACTION = 0.5
+LATENCY_WINDOW = 200
+
+
+class _Attempt:
+    """One OpenClaw subprocess, reporting to a shared queue when it exits"""
+
+    def __init__(self, index, argv, results, slot):
+        """slot is an acquired process slot; it is released once the process has exited"""
+        self.index = index
+        self.started = time.monotonic()
+        self._slot = slot
+        try:
+            # Own process group, so cancelling also stops anything OpenClaw spawned
+            self.proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                         start_new_session=True)
+        except BaseException:
+            slot.release()
+            raise
+        self._results = results
+        threading.Thread(target=self._wait, daemon=True).start()
+
+    def _wait(self):
+        try:
+            out, _ = self.proc.communicate()
+        finally:
+            self._slot.release()
+        self._results.put((self, self.proc.returncode, out or '', time.monotonic() - self.started))
+
+    def cancel(self):
+        if self.proc.poll() is None:
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except OSError:
+                self.proc.kill()
+
+
+class HedgedRunner:
+    def __init__(self, percentile=None, default_delay=None, hard_deadline=None, max_processes=None):
+        self.percentile = float(percentile or os.environ.get('OPENCLAW_HEDGE_PERCENTILE', 90))
+        self.default_delay = float(default_delay or os.environ.get('OPENCLAW_HEDGE_DELAY', 8))
+        self.hard_deadline = float(hard_deadline or os.environ.get('OPENCLAW_HARD_DEADLINE', 20))
+        self.max_processes = int(max_processes or os.environ.get('OPENCLAW_MAX_PROCESSES', 8))
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stats = {
+            'calls': 0,
+            'hedged': 0,
+            'hedges_skipped': 0,
+            'primary_wins': 0,
+            'hedge_wins': 0,
+            'failures': 0,
+            'deadline_fallbacks': 0,
+        }
+
+    def hedge_delay(self):
+        """Seconds to wait on the first attempt before starting a second one"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        longest = self.hard_deadline * MAX_HEDGE_FRACTION
+        if len(samples) < MIN_SAMPLES:
+            return min(self.default_delay, longest)
+        rank = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return min(max(samples[rank], MIN_HEDGE_DELAY), longest)
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def deadline(self):
+        """A hard deadline from now, for sharing one budget across several run() calls"""
+        return time.monotonic() + self.hard_deadline
+
+    def run(self, make_argv, accept=None, deadline=None):
+        """Run OpenClaw hedged; returns stdout of the first accepted answer or None.
+
+        make_argv(attempt) builds the command line for attempt 0 or 1 (each
+        should get its own session id). accept(stdout) decides whether an
+        answer counts; by default any non-empty output does. deadline (from
+        self.deadline()) caps a request that retries; without it each call
+        gets the full hard deadline.
+        """
+        accept = accept or (lambda out: bool(out.strip()))
+        self._count('calls')
+        start = time.monotonic()
+        deadline = min(deadline or start + self.hard_deadline, start + self.hard_deadline)
+        if start >= deadline:
+            self._count('deadline_fallbacks')
+            return None
+        hedge_at = start + self.hedge_delay()
+        if not self._slots.acquire(timeout=deadline - start):
+            # Every OpenClaw slot stayed busy until the deadline
+            self._count('deadline_fallbacks')
+            return None
+        results = queue.Queue()
+        attempts = [_Attempt(0, make_argv(0), results, self._slots)]
+        finished = set()
+        hedge_pending = True
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    with self._lock:
+                        # Censored samples: these took at least until the deadline
+                        for attempt in attempts:
+                            if attempt.index not in finished:
+                                self._latencies.append(deadline - attempt.started)
+                        self._stats['deadline_fallbacks'] += 1
+                    return None
+                wake = min(hedge_at, deadline) if hedge_pending else deadline
+                try:
+                    attempt, code, out, elapsed = results.get(timeout=max(0, wake - now))
+                except queue.Empty:
+                    if hedge_pending and hedge_at <= time.monotonic() < deadline:
+                        hedge_pending = False
+                        if self._slots.acquire(blocking=False):
+                            attempts.append(_Attempt(1, make_argv(1), results, self._slots))
+                            self._count('hedged')
+                        else:
+                            self._count('hedges_skipped')
+                    continue
+                finished.add(attempt.index)
+                if code == 0 and accept(out):
+                    with self._lock:
+                        self._latencies.append(elapsed)
+                        self._stats['hedge_wins' if attempt.index else 'primary_wins'] += 1
+                    return out
+                if len(finished) == len(attempts):
+                    # Nothing left in flight; a fast failure is not worth a hedge
+                    self._count('failures')
+                    return None
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def stats(self):
+        """Counters plus the current hedge delay, for tuning"""
+        with self._lock:
+            stats = dict(self._stats)
+            samples = len(self._latencies)
+        stats['hedge_rate'] = round(stats['hedged'] / stats['calls'], 3) if stats['calls'] else 0.0
+        stats['hedge_win_rate'] = round(stats['hedge_wins'] / stats['hedged'], 3) if stats['hedged'] else 0.0
+        stats['latency_samples'] = samples
+        stats['hedge_delay'] = round(self.hedge_delay(), 3)
+        stats['hard_deadline'] = self.hard_deadline
+        stats['percentile'] = self.percentile
+        stats['max_processes'] = self.max_processes
+        return stats
@@ -1,4 +1,11 @@
-import http.server,socketserver,json,random,subprocess,os,shutil,time,urllib.request
+import http.server,socketserver,json,random,os,shutil,time,urllib.request
+from court_batch import run_batch
+from court_cases import BULK_MAX,SUMMARIES,CaseIdAllocator,CaseQueue,generate_cases,openclaw_case,template_case
+from court_uniqueness import UniquenessIndex,trial_key
+from court_hedge import HedgedRunner
+from court_uploads import CHUNK_SIZE,BodyError,evidence_content_type,evidence_path,read_body,store_evidence
+from court_trials import MAX_TRIALS,ArgumentTable,TrialStore,UnknownTrial
+from urllib.parse import urlsplit,parse_qs
 PORT=3040
 
 # Moltbook API configuration
@@ -50,25 +57,21 @@ def find_openclaw():
             return path
     return None
 
-# Track used statements per session to avoid repeats
-used_statements = {}
+# Fingerprints of every argument and reasoning emitted, to avoid near-repeats
+# (per-trial history covers as many trials as TRIALS holds)
+UNIQUENESS=UniquenessIndex(max_trials=MAX_TRIALS)
 
-def get_unique_reasoning(judge, winner):
-    """Get a unique reasoning that hasn't been used recently"""
-    key = f"{judge}_{winner}"
-    if key not in used_statements:
-        used_statements[key] = []
-    
-    available = [r for r in JR[judge]['P' if winner == 'plaintiff' else 'D'] if r not in used_statements[key]]
-    
-    # If all used, reset
-    if not available:
-        used_statements[key] = []
-        available = JR[judge]['P' if winner == 'plaintiff' else 'D']
-    
-    choice = random.choice(available)
-    used_statements[key].append(choice)
-    return choice
+# Hedged OpenClaw calls; stats served at GET /api/openclaw/stats
+HEDGER=HedgedRunner()
+
+# OpenClaw generations per argument before giving up on a near-duplicate
+OPENCLAW_ATTEMPTS=2
+
+def get_unique_reasoning(judge, winner, trial_id=None):
+    """Get a reasoning that isn't a near-repeat of one already heard in this trial"""
+    options = list(JR.get(judge, JR['PortDev'])['P' if winner == 'plaintiff' else 'D'])
+    random.shuffle(options)
+    return UNIQUENESS.choose(options, trial_id)
 
 # LOGICAL arguments - coherent narratives per round
 PLAINTIFF_ARGUMENTS = {
@@ -140,42 +143,52 @@ DEFENDANT_ARGUMENTS = {
 # Judge personalities with unique reasonings
 JR={'PortDev':{'P':["Having examined the technical evidence presented, I find the plaintiff's case compelling. The blockchain timestamps are immutable and clearly establish priority. The code analysis reveals striking similarities that cannot be dismissed as coincidence. The defendant's claim of independent discovery lacks the technical substantiation required in this Court.","After reviewing the technical documentation, the evidence overwhelmingly favors the plaintiff. The commit history, variable naming patterns, and exploit methodology all point to a clear timeline of theft. The probability of independent discovery producing such identical results is statistically negligible.","The technical forensics don't lie. On-chain data provides an immutable record that definitively proves the plaintiff's prior discovery. The defendant's timeline simply doesn't align with the cryptographic evidence presented."],'D':["Upon technical review, I find the defendant's methods differ significantly from the plaintiff's approach. The code similarity, while present, falls within acceptable parameters for independent discovery of the same vulnerability. Without concrete forensic evidence of unauthorized access, I cannot support the theft allegation.","The technical evidence presented by the plaintiff is insufficient to prove theft beyond reasonable doubt. While similarities exist, the defendant's approach demonstrates fundamental methodological differences. The blockchain records alone cannot establish intent or copying.","A thorough technical analysis reveals the defendant's research methodology was sound and independent. The absence of suspicious on-chain transactions or access logs undermines the plaintiff's central claim. Similar code patterns are expected when multiple researchers target the same vulnerability."]},'MikeWeb':{'P':["The community has spoken, and the consensus is clear. Multiple witnesses have corroborated the plaintiff's timeline of discovery. The defendant's reputation in security circles has been questioned before, and this pattern of behavior concerns me. The social proof overwhelmingly validates the plaintiff's original contribution.","Having consulted with respected members of our security community, I find the plaintiff's account credible and consistent. The network effects of early discovery should naturally favor the original finder. The defendant's sudden emergence with identical findings raises serious questions about attribution.","Community sentiment strongly supports the plaintiff. Their track record of responsible disclosure and contribution to ecosystem security speaks volumes. The defendant's history of contested claims cannot be ignored in my evaluation."],'D':["The community feedback I've received paints a different picture than the plaintiff suggests. Multiple peers have vouched for the defendant's integrity and technical capability. Their reputation metrics show consistent, quality research over an extended period. I cannot discount this social validation.","After reaching out to mutual connections in the security space, I find the defendant's account credible. The community trusts their work, and there's no pattern suggesting copycat behavior. The plaintiff's allegations appear isolated and lacking broader community support.","Social proof actually favors the defendant here. Their contribution history demonstrates independent research capability. The community vouches for their character, and I see no evidence of the pattern the plaintiff alleges."]},'Keone':{'P':["The blockchain never lies, and the data here is unequivocal. Transaction timestamps on the Monad network definitively prove the plaintiff's prior discovery. The immutable record shows disclosure timing that predates the defendant's claims by significant margins. This on-chain evidence is the bedrock of my decision.","I've verified the on-chain proofs myself. The transaction hashes confirm the plaintiff's timeline beyond any doubt. Smart contract interactions demonstrate their early engagement with this vulnerability. The defendant's timeline simply cannot compete with cryptographic truth.","Block explorer data provides irrefutable evidence of the plaintiff's priority. Every transaction, every interaction, every commitment is recorded immutably. The on-chain footprint tells a story that contradicts the defendant's narrative completely."],'D':["My analysis of the blockchain data tells a different story. While timestamps exist, they don't conclusively prove theft. The defendant's wallet history shows consistent research activity predating this dispute. On-chain evidence actually supports their claimed timeline.","I've examined the transaction records carefully. The blockchain shows no suspicious transfers or unauthorized access patterns. The defendant's on-chain behavior is consistent with legitimate independent research. The plaintiff's interpretation of the data is selective and misleading.","Block explorer analysis reveals nothing incriminating about the defendant's transactions. Their wallet history demonstrates ongoing security research activity. The on-chain evidence, properly understood, actually supports the defense's position."]},'James':{'P':["This Court has established clear precedent in attribution disputes. Case BEEF-2023-001 explicitly favored the original finder under similar circumstances. The historical record of rulings consistently protects prior discovery claims. I see no reason to deviate from this established legal framework.","Precedent is paramount in maintaining consistency within our judicial system. Previous cases involving vulnerability discovery have uniformly supported the original researcher. The defendant's arguments fail to distinguish this case from prior rulings that favored attribution protection.","The legal framework governing intellectual contribution in our ecosystem is clear. Historical rulings consistently reward genuine discovery and penalize appropriation. This case follows a familiar pattern where the original finder has prevailed."],'D':["While precedent is important, case DEF-2022-015 established that proof beyond reasonable doubt is required for theft claims. The plaintiff has failed to meet this burden. Historical dismissals of similar weak-evidence cases guide my decision here.","The precedent actually favors the defendant in this instance. Previous rulings have consistently required concrete evidence of access or copying. The plaintiff's circumstantial claims don't meet the threshold established by this Court's history.","Legal precedent requires more than temporal coincidence to prove theft. Case law consistently demands substantive evidence of wrongdoing. The defendant is entitled to the benefit of reasonable doubt that our precedents guarantee."]},'Harpal':{'P':["Quality of research must be protected to maintain the integrity of our ecosystem. The plaintiff's contribution history demonstrates consistent, high-quality security work. Their track record of responsible disclosures speaks to their character. Genuine effort deserves recognition and protection from appropriation.","I've reviewed both parties' contribution histories extensively. The plaintiff shows a pattern of meaningful, original research that advances our collective security. The defendant's record, by contrast, reveals opportunistic behavior inconsistent with genuine discovery.","Meritocracy demands that we reward authentic contribution. The plaintiff's body of work establishes them as a serious researcher whose efforts benefit the entire ecosystem. Their discovery claim aligns with their demonstrated capabilities and ethical standards."],'D':["Both parties present valid contribution histories that deserve consideration. The defendant's track record demonstrates consistent quality and originality in their security research. Creating reasonable doubt about theft allegations requires acknowledging their legitimate capabilities and past contributions.","A merit-based evaluation must recognize the defendant's established research pedigree. Their history shows independent discovery capability that predates this dispute. The plaintiff's attempt to discredit their entire body of work is both unfair and inaccurate.","The defendant's contribution history is equally worthy of protection. They have consistently produced quality security research that benefits our ecosystem. Both parties show merit, but the defense evidence creates sufficient reasonable doubt about the theft claim."]},'Anago':{'P':["The protocol disclosure rules are clear and were violated in this case. Standard procedures for responsible vulnerability reporting were not followed by the defendant. The timeline shows disregard for established ethical norms governing security research. These violations undermine their credibility significantly.","Established protocols exist to prevent exactly this type of dispute. The defendant's failure to follow standard disclosure procedures suggests opportunistic rather than legitimate behavior. Ethical guidelines were clearly breached in their handling of this vulnerability.","Protocol adherence is fundamental to maintaining trust in our security ecosystem. The defendant's actions demonstrate a pattern of cutting corners and ignoring established norms. These ethical violations cannot be overlooked in my evaluation of this case."],'D':["The defendant has demonstrably followed all protocol requirements. Their disclosure timeline adhered to established responsible disclosure procedures. Reviewing their documentation shows full compliance with ethical guidelines governing security research.","All standard protocols were properly observed by the defendant. Their research methodology followed accepted practices for independent discovery. The claim of ethical violations is unsubstantiated by the actual record of their conduct.","Protocol compliance review shows the defendant met all requirements. Their disclosure followed industry-standard procedures precisely. No violations of ethical guidelines are evident in their documented behavior."]}}
 
-class H(http.server.BaseHTTPRequestHandler):
-  def log_message(self,f,*a):pass
-  def do_OPTIONS(self):
-    self.send_response(204)
-    self.end_headers()
-  def do_GET(self):
-    self.send_response(200)
-    self.send_header('Content-Type','application/json')
-    self.end_headers()
-    self.wfile.write(json.dumps({'status':'ok'}).encode())
-  def do_POST(self):
-    global used_statements
-    c=int(self.headers.get('Content-Length',0));b=self.rfile.read(c)if c else b'{}'
-    try:data=json.loads(b)
-    except:data={}
-    self.send_response(200)
-    self.send_header('Content-Type','application/json')
-    self.end_headers()
+def make_case(shared=None):
+  """One case from OpenClaw, or from the templates if that fails"""
+  openclaw_cmd=shared.get('openclaw_cmd',find_openclaw)if shared else find_openclaw()
+  if openclaw_cmd:
+    try:
+      case=openclaw_case(lambda sid,prompt:HEDGER.run(lambda i:[openclaw_cmd,'agent','--local','--session-id',f'{sid}_{i}','-m',prompt],lambda o:'{' in o))
+      if case:return case,'openclaw_ai'
+    except Exception as e:
+      print(f"OpenClaw case generation failed: {e}")
+  return template_case(),'random_fallback'
+
+# Collision-free case ids, and cases kept ready to serve (CASE_QUEUE_TARGET=0 disables)
+CASE_IDS=CaseIdAllocator()
+CASE_QUEUE_TARGET=int(os.environ.get('CASE_QUEUE_TARGET',0))
+CASE_QUEUE=CaseQueue(make_case,CASE_IDS,CASE_QUEUE_TARGET) if CASE_QUEUE_TARGET else None
+if CASE_QUEUE is not None:CASE_QUEUE.refill()
+
+# Server-side trials; template arguments and reasonings are interned first so trials store them as ids
+TRIALS=TrialStore(ArgumentTable([a for args in(PLAINTIFF_ARGUMENTS,DEFENDANT_ARGUMENTS)for r in args.values()for a in r]+[x for side in JR.values()for r in side.values()for x in r]+list(JR)))
+
+def route(path,data,headers,shared=None):
+  """Handle one court POST and return its JSON response (also used per /api/batch operation)"""
+  if path=='/api/trials':
+    cd=data.get('caseData')or{}
+    trial=TRIALS.create(cd.get('case_id')if isinstance(cd,dict)else None)
+    return {'success':True,'trialId':trial.trial_id,'trial':TRIALS.to_json(trial)}
+  
+  elif path=='/api/generate-argument':
+    trial=TRIALS.find(data.get('trialId'))
+    r=data.get('role','plaintiff')
+    n=data.get('round',1)
+    case_data=data.get('caseData',{})
+    a='NadCourt-Advocate'if r=='plaintiff'else'NadCourt-Defender'
+    t=trial_key(data)
     
-    if self.path=='/api/generate-argument':
-      r=data.get('role','plaintiff')
-      n=data.get('round',1)
-      case_data=data.get('caseData',{})
-      a='NadCourt-Advocate'if r=='plaintiff'else'NadCourt-Defender'
-      
-      # Try OpenClaw AI first for unique argument generation
-      openclaw_cmd=find_openclaw()
-      argument=None
-      
-      if openclaw_cmd:
-        try:
-          # Create prompt for OpenClaw
-          angles=['timeline discrepancy','technical evidence','opponent credibility','financial damages','pattern of behavior','coincidence probability']
-          angle=random.choice(angles)
-          
-          prompt=f"""You are {a}, a passionate AI legal advocate in Agent Court.
+    # Try OpenClaw AI first for unique argument generation
+    openclaw_cmd=shared.get('openclaw_cmd',find_openclaw)if shared else find_openclaw()
+    argument=None
+    
+    if openclaw_cmd:
+      try:
+        # Create prompt for OpenClaw
+        angles=['timeline discrepancy','technical evidence','opponent credibility','financial damages','pattern of behavior','coincidence probability']
+        angle=random.choice(angles)
+        
+        prompt=f"""You are {a}, a passionate AI legal advocate in Agent Court.
 Case: {case_data.get('summary','Security vulnerability discovery dispute')}
 Your position: {r}
 Round: {n} of 6
@@ -185,146 +198,236 @@ Generate ONE completely unique, short legal argument (2-3 sentences, ~80-120 wor
 Be fiery, confrontational, and concise. Use specific technical details.
 
 Return ONLY the argument:"""
-          
-          result=subprocess.run(
-            [openclaw_cmd,'agent','--local','--session-id',f'court_{int(time.time())}_{random.randint(1,100000)}','-m',prompt],
-            capture_output=True,
-            text=True,
-            timeout=30
-          )
-          if result.returncode==0 and result.stdout.strip() and len(result.stdout.strip())>30:
-            argument=result.stdout.strip()
+        
+        # One hard deadline for the whole request, regenerations included
+        deadline=HEDGER.deadline()
+        for attempt in range(OPENCLAW_ATTEMPTS):
+          sid=f'court_{int(time.time())}_{random.randint(1,100000)}'
+          # Hedged: a slow call gets a parallel twin, and past the hard deadline we use the template
+          out=HEDGER.run(lambda i:[openclaw_cmd,'agent','--local','--session-id',f'{sid}_{i}','-m',prompt],lambda o:len(o.strip())>30,deadline)
+          if not out:break
+          # Regenerate when this trial or a recent one already heard something too similar
+          if UNIQUENESS.claim(out.strip(),t):
+            argument=out.strip()
             print(f"OpenClaw generated argument for {r} round {n}")
-        except Exception as e:
-          print(f"OpenClaw failed: {e}, using template fallback")
-      
-      # Fallback to template-based arguments
-      if not argument:
-        args=PLAINTIFF_ARGUMENTS if r=='plaintiff' else DEFENDANT_ARGUMENTS
-        round_args=args.get(n,args[1])
-        argument=random.choice(round_args)
-      
-      self.wfile.write(json.dumps({
-        'success':True,
-        'agent':a,
-        'role':r,
-        'argument':argument,
-        'round':n,
-        'source':'openclaw_ai' if openclaw_cmd and argument else 'template_fallback'
-      }).encode())
+            break
+          print(f"OpenClaw argument for {r} round {n} was a near-duplicate (attempt {attempt+1})")
+      except Exception as e:
+        print(f"OpenClaw failed: {e}, using template fallback")
     
-    elif self.path=='/api/judge-evaluation':
-      j=data.get('judge','PortDev')
-      p_args=data.get('plaintiffArgs',[])
-      d_args=data.get('defendantArgs',[])
-      
-      # Analyze arguments to determine scores
-      p_str=' '.join(p_args[-2:])if p_args else ''
-      d_str=' '.join(d_args[-2:])if d_args else ''
-      
-      # Keyword analysis for scoring
-      p_evidence=('blockchain' in p_str.lower() or 'timestamp' in p_str.lower() or 'proof' in p_str.lower())
-      p_technical=('code' in p_str.lower() or 'technical' in p_str.lower() or 'exploit' in p_str.lower())
-      p_logic=('timeline' in p_str.lower() or 'pattern' in p_str.lower() or 'document' in p_str.lower())
-      
-      d_evidence=('logs' in d_str.lower() or 'audit' in d_str.lower() or 'research' in d_str.lower())
-      d_technical=('method' in d_str.lower() or 'analysis' in d_str.lower() or 'implementation' in d_str.lower())
-      d_logic=('independent' in d_str.lower() or 'zero' in d_str.lower() or 'coincidence' in d_str.lower())
-      
-      # Base scores with variation
-      base_p=random.randint(70,85)
-      base_d=random.randint(65,82)
-      
-      # Adjust based on argument quality
-      p_logic_score=min(95,base_p+(10 if p_logic else 0)+random.randint(-5,5))
-      p_evidence_score=min(95,base_p+(8 if p_evidence else 0)+random.randint(-5,5))
-      p_rebuttal_score=min(95,base_p+random.randint(-3,8))
-      p_clarity_score=min(95,base_p+random.randint(-5,5))
-      
-      d_logic_score=min(95,base_d+(10 if d_logic else 0)+random.randint(-5,5))
-      d_evidence_score=min(95,base_d+(8 if d_evidence else 0)+random.randint(-5,5))
-      d_rebuttal_score=min(95,base_d+random.randint(-3,8))
-      d_clarity_score=min(95,base_d+random.randint(-5,5))
-      
-      p={'logic':p_logic_score,'evidence':p_evidence_score,'rebuttal':p_rebuttal_score,'clarity':p_clarity_score}
-      d={'logic':d_logic_score,'evidence':d_evidence_score,'rebuttal':d_rebuttal_score,'clarity':d_clarity_score}
-      
-      pt=sum(p.values())//4
-      dt=sum(d.values())//4
-      w='plaintiff'if pt>dt else'defendant'
-      
-      # Add totals to response
-      p['total']=pt
-      d['total']=dt
-      
-      # Generate contextual reasoning based on arguments
-      if j=='PortDev':
-        if w=='plaintiff':
-          if p_technical:rc=f"Technical analysis confirms the plaintiff's claims. The code similarities and blockchain evidence presented are compelling. Defendant's rebuttal regarding '{d_str[:40]}...' lacks sufficient technical substantiation."
-          else:rc=f"The plaintiff's timeline evidence is technically sound. While both parties present arguments, the cryptographic proof tips the balance. Defendant's claim of '{d_str[:40]}...' doesn't overcome the forensic evidence."
-        else:
-          if d_technical:rc=f"Technical review favors the defendant. Their methodology demonstrates independent research with distinct approaches. Plaintiff's technical claims about '{p_str[:40]}...' don't establish theft beyond reasonable doubt."
-          else:rc=f"The technical evidence is insufficient to prove copying. Defendant's arguments regarding '{d_str[:40]}...' create reasonable doubt about the theft allegation."
-      elif j=='MikeWeb':
-        if w=='plaintiff':rc=f"Community consensus supports the plaintiff. Their argument about '{p_str[:50]}...' resonates with established researchers. Defendant's counter regarding '{d_str[:40]}...' lacks community validation."
-        else:rc=f"Community feedback favors the defendant. Their explanation of '{d_str[:50]}...' is consistent with their reputation. Plaintiff's claims about '{p_str[:40]}...' appear isolated from broader sentiment."
-      elif j=='Keone':
-        if w=='plaintiff':rc=f"Blockchain evidence is definitive. The plaintiff's proof of '{p_str[:50]}...' is recorded immutably. Defendant's timeline regarding '{d_str[:40]}...' contradicts on-chain data."
-        else:rc=f"On-chain analysis doesn't support theft claims. Defendant's wallet history shows '{d_str[:50]}...' consistent with independent research. Plaintiff's interpretation of blockchain data is selective."
-      elif j=='James':
-        if w=='plaintiff':rc=f"Precedent clearly favors the plaintiff. Their argument establishing '{p_str[:50]}...' meets the standard set in prior cases. Defendant's distinction regarding '{d_str[:40]}...' is unpersuasive."
-        else:rc=f"Legal precedent requires proof beyond reasonable doubt. Defendant's position on '{d_str[:50]}...' creates sufficient doubt. Plaintiff's claim of '{p_str[:40]}...' doesn't meet the evidentiary threshold."
-      elif j=='Harpal':
-        if w=='plaintiff':rc=f"The plaintiff's contribution quality evident in '{p_str[:50]}...' deserves protection. Defendant's response regarding '{d_str[:40]}...' doesn't match the plaintiff's demonstrated research standards."
-        else:rc=f"Both parties show merit, but defendant's '{d_str[:50]}...' establishes reasonable doubt. Plaintiff's '{p_str[:40]}...' alone cannot overcome presumption of innocence."
-      else: # Anago
-        if w=='plaintiff':rc=f"Protocol violations evident in defendant's approach to '{d_str[:50]}...' undermine their credibility. Plaintiff's adherence to '{p_str[:40]}...' demonstrates proper conduct."
-        else:rc=f"Defendant followed proper protocols in '{d_str[:50]}...'. Plaintiff's allegations regarding '{p_str[:40]}...' don't establish procedural violations."
-      
-      self.wfile.write(json.dumps({'success':True,'judge':j,'evaluation':{'plaintiff':p,'defendant':d,'reasoning':rc,'winner':w},'source':'argument_aware'}).encode())
+    source='openclaw_ai'
+    # Fallback to template-based arguments
+    if not argument:
+      source='template_fallback'
+      args=PLAINTIFF_ARGUMENTS if r=='plaintiff' else DEFENDANT_ARGUMENTS
+      round_args=list(args.get(n,args[1]))
+      random.shuffle(round_args)
+      argument=UNIQUENESS.choose(round_args,t)
     
-    elif self.path=='/api/generate-case':
-      used_statements={}  # Reset for new case
-      self.wfile.write(json.dumps({'success':True,'case':{'case_id':f"CASE-{random.randint(1000,9999)}",'case_type':'Security vulnerability dispute','plaintiff':'SecurityResearcher_A','defendant':'BugBountyHunter_B','summary':'Dispute over discovery of critical smart contract vulnerability.','evidence_type':'blockchain timestamps','stakes':'$50000'}}).encode())
+    if trial:TRIALS.add_argument(trial,r,argument)
     
-    elif self.path=='/api/auth/moltbook':
-      # Sign in with Moltbook endpoint
-      token=data.get('identity_token')
-      if not token:
-        self.wfile.write(json.dumps({'success':False,'error':'No identity token provided'}).encode())
-        return
-      
-      agent=verify_moltbook_token(token)
-      if agent:
-        self.wfile.write(json.dumps({
-          'success':True,
-          'agent':{
-            'id':agent.get('id'),
-            'name':agent.get('name'),
-            'karma':agent.get('karma'),
-            'stats':agent.get('stats',{}),
-            'owner':agent.get('owner',{})
-          },
-          'message':'Authenticated with Moltbook'
-        }).encode())
-      else:
-        self.wfile.write(json.dumps({'success':False,'error':'Invalid or expired token'}).encode())
+    return {
+      'success':True,
+      'agent':a,
+      'role':r,
+      'argument':argument,
+      'round':n,
+      'source':source
+    }
+  
+  elif path=='/api/judge-evaluation':
+    trial=TRIALS.find(data.get('trialId'))
+    j=data.get('judge','PortDev')
+    # With only a trialId, the history comes from the server-side trial
+    p_args=data.get('plaintiffArgs',TRIALS.arguments(trial,'plaintiff')if trial else[])
+    d_args=data.get('defendantArgs',TRIALS.arguments(trial,'defendant')if trial else[])
     
-    elif self.path=='/api/auth/verify':
-      # Verify token and return agent info (for middleware)
-      auth_header=self.headers.get('X-Moltbook-Identity')
-      if not auth_header:
-        self.wfile.write(json.dumps({'success':False,'error':'No X-Moltbook-Identity header'}).encode())
-        return
-      
-      agent=verify_moltbook_token(auth_header)
-      if agent:
-        self.wfile.write(json.dumps({'success':True,'valid':True,'agent':agent}).encode())
+    # Analyze arguments to determine scores
+    p_str=' '.join(p_args[-2:])if p_args else ''
+    d_str=' '.join(d_args[-2:])if d_args else ''
+    
+    # Keyword analysis for scoring
+    p_evidence=('blockchain' in p_str.lower() or 'timestamp' in p_str.lower() or 'proof' in p_str.lower())
+    p_technical=('code' in p_str.lower() or 'technical' in p_str.lower() or 'exploit' in p_str.lower())
+    p_logic=('timeline' in p_str.lower() or 'pattern' in p_str.lower() or 'document' in p_str.lower())
+    
+    d_evidence=('logs' in d_str.lower() or 'audit' in d_str.lower() or 'research' in d_str.lower())
+    d_technical=('method' in d_str.lower() or 'analysis' in d_str.lower() or 'implementation' in d_str.lower())
+    d_logic=('independent' in d_str.lower() or 'zero' in d_str.lower() or 'coincidence' in d_str.lower())
+    
+    # Base scores with variation
+    base_p=random.randint(70,85)
+    base_d=random.randint(65,82)
+    
+    # Adjust based on argument quality
+    p_logic_score=min(95,base_p+(10 if p_logic else 0)+random.randint(-5,5))
+    p_evidence_score=min(95,base_p+(8 if p_evidence else 0)+random.randint(-5,5))
+    p_rebuttal_score=min(95,base_p+random.randint(-3,8))
+    p_clarity_score=min(95,base_p+random.randint(-5,5))
+    
+    d_logic_score=min(95,base_d+(10 if d_logic else 0)+random.randint(-5,5))
+    d_evidence_score=min(95,base_d+(8 if d_evidence else 0)+random.randint(-5,5))
+    d_rebuttal_score=min(95,base_d+random.randint(-3,8))
+    d_clarity_score=min(95,base_d+random.randint(-5,5))
+    
+    p={'logic':p_logic_score,'evidence':p_evidence_score,'rebuttal':p_rebuttal_score,'clarity':p_clarity_score}
+    d={'logic':d_logic_score,'evidence':d_evidence_score,'rebuttal':d_rebuttal_score,'clarity':d_clarity_score}
+    
+    pt=sum(p.values())//4
+    dt=sum(d.values())//4
+    w='plaintiff'if pt>dt else'defendant'
+    
+    # Add totals to response
+    p['total']=pt
+    d['total']=dt
+    
+    # Generate contextual reasoning based on arguments
+    if j=='PortDev':
+      if w=='plaintiff':
+        if p_technical:rc=f"Technical analysis confirms the plaintiff's claims. The code similarities and blockchain evidence presented are compelling. Defendant's rebuttal regarding '{d_str[:40]}...' lacks sufficient technical substantiation."
+        else:rc=f"The plaintiff's timeline evidence is technically sound. While both parties present arguments, the cryptographic proof tips the balance. Defendant's claim of '{d_str[:40]}...' doesn't overcome the forensic evidence."
       else:
-        self.wfile.write(json.dumps({'success':False,'valid':False,'error':'Invalid token'}).encode())
+        if d_technical:rc=f"Technical review favors the defendant. Their methodology demonstrates independent research with distinct approaches. Plaintiff's technical claims about '{p_str[:40]}...' don't establish theft beyond reasonable doubt."
+        else:rc=f"The technical evidence is insufficient to prove copying. Defendant's arguments regarding '{d_str[:40]}...' create reasonable doubt about the theft allegation."
+    elif j=='MikeWeb':
+      if w=='plaintiff':rc=f"Community consensus supports the plaintiff. Their argument about '{p_str[:50]}...' resonates with established researchers. Defendant's counter regarding '{d_str[:40]}...' lacks community validation."
+      else:rc=f"Community feedback favors the defendant. Their explanation of '{d_str[:50]}...' is consistent with their reputation. Plaintiff's claims about '{p_str[:40]}...' appear isolated from broader sentiment."
+    elif j=='Keone':
+      if w=='plaintiff':rc=f"Blockchain evidence is definitive. The plaintiff's proof of '{p_str[:50]}...' is recorded immutably. Defendant's timeline regarding '{d_str[:40]}...' contradicts on-chain data."
+      else:rc=f"On-chain analysis doesn't support theft claims. Defendant's wallet history shows '{d_str[:50]}...' consistent with independent research. Plaintiff's interpretation of blockchain data is selective."
+    elif j=='James':
+      if w=='plaintiff':rc=f"Precedent clearly favors the plaintiff. Their argument establishing '{p_str[:50]}...' meets the standard set in prior cases. Defendant's distinction regarding '{d_str[:40]}...' is unpersuasive."
+      else:rc=f"Legal precedent requires proof beyond reasonable doubt. Defendant's position on '{d_str[:50]}...' creates sufficient doubt. Plaintiff's claim of '{p_str[:40]}...' doesn't meet the evidentiary threshold."
+    elif j=='Harpal':
+      if w=='plaintiff':rc=f"The plaintiff's contribution quality evident in '{p_str[:50]}...' deserves protection. Defendant's response regarding '{d_str[:40]}...' doesn't match the plaintiff's demonstrated research standards."
+      else:rc=f"Both parties show merit, but defendant's '{d_str[:50]}...' establishes reasonable doubt. Plaintiff's '{p_str[:40]}...' alone cannot overcome presumption of innocence."
+    else: # Anago
+      if w=='plaintiff':rc=f"Protocol violations evident in defendant's approach to '{d_str[:50]}...' undermine their credibility. Plaintiff's adherence to '{p_str[:40]}...' demonstrates proper conduct."
+      else:rc=f"Defendant followed proper protocols in '{d_str[:50]}...'. Plaintiff's allegations regarding '{p_str[:40]}...' don't establish procedural violations."
+    
+    # Quoted snippets make these templates repeat easily; swap in a canned reasoning if so
+    if not UNIQUENESS.claim(rc,trial_key(data)):rc=get_unique_reasoning(j,w,trial_key(data))
+    
+    e={'plaintiff':p,'defendant':d,'reasoning':rc,'winner':w}
+    if trial:TRIALS.add_evaluation(trial,j,e)
     
+    return {'success':True,'judge':j,'evaluation':e,'source':'argument_aware'}
+  
+  elif path=='/api/generate-case':
+    if 'count' in data:
+      # Bulk mode: up to BULK_MAX distinct cases in one call
+      try:count=max(1,min(int(data['count']),BULK_MAX))
+      except(TypeError,ValueError):return {'success':False,'error':'count must be an integer'}
+      cases,dropped=generate_cases(count,lambda:make_case(shared),CASE_IDS)
+      if not cases:return {'success':False,'error':'Could not generate distinct cases','duplicates_dropped':dropped}
+      return {'success':True,'cases':cases,'count':len(cases),'duplicates_dropped':dropped}
+    UNIQUENESS.reset_trial(None)  # Reset for new case
+    case=CASE_QUEUE.take() if CASE_QUEUE is not None else None
+    if case:source=case.pop('source')
+    else:
+      case,source=make_case(shared)
+      case['case_id']=CASE_IDS.next()
+      SUMMARIES.add(str(case.get('summary','')))
+    return {'success':True,'case':case,'source':source}
+  
+  elif path=='/api/auth/moltbook':
+    # Sign in with Moltbook endpoint
+    token=data.get('identity_token')
+    if not token:
+      return {'success':False,'error':'No identity token provided'}
+    
+    agent=verify_moltbook_token(token)
+    if agent:
+      return {
+        'success':True,
+        'agent':{
+          'id':agent.get('id'),
+          'name':agent.get('name'),
+          'karma':agent.get('karma'),
+          'stats':agent.get('stats',{}),
+          'owner':agent.get('owner',{})
+        },
+        'message':'Authenticated with Moltbook'
+      }
+    else:
+      return {'success':False,'error':'Invalid or expired token'}
+  
+  elif path=='/api/auth/verify':
+    # Verify token and return agent info (for middleware)
+    auth_header=headers.get('X-Moltbook-Identity')
+    if not auth_header:
+      return {'success':False,'error':'No X-Moltbook-Identity header'}
+    
+    agent=verify_moltbook_token(auth_header)
+    if agent:
+      return {'success':True,'valid':True,'agent':agent}
+    else:
+      return {'success':False,'valid':False,'error':'Invalid token'}
+  
+  else:
+    return {'error':'not found'}
+
+
+class H(http.server.BaseHTTPRequestHandler):
+  def log_message(self,f,*a):pass
+  def do_OPTIONS(self):
+    self.send_response(204)
+    self.end_headers()
+  def do_GET(self):
+    if self.path=='/api/openclaw/stats':self.send_json({'success':True,'stats':HEDGER.stats()})
+    elif self.path.startswith('/api/trials/'):
+      trial=TRIALS.get(self.path[len('/api/trials/'):])
+      if trial:self.send_json({'success':True,'trial':TRIALS.to_json(trial)})
+      else:self.send_json({'success':False,'error':'Unknown trial'},404)
+    elif self.path.startswith('/api/evidence/'):self.send_evidence(self.path[len('/api/evidence/'):])
+    else:self.send_json({'status':'ok'})
+  def do_POST(self):
+    u=urlsplit(self.path)
+    try:
+      if u.path=='/api/evidence':
+        self.send_json(store_evidence(self,parse_qs(u.query)))
+        return
+      b=read_body(self,u.path)or b'{}'
+    except BodyError as e:
+      # Rest of the body is unread, so the connection can't be reused
+      self.close_connection=True
+      self.send_json({'success':False,'error':str(e)},e.status)
+      return
+    except OSError as e:
+      # Disk or case file write failed mid-upload
+      print(f"Evidence upload failed: {e}")
+      self.close_connection=True
+      self.send_json({'success':False,'error':'Could not store evidence'},500)
+      return
+    try:data=json.loads(b)
+    except:data={}
+    if u.path=='/api/batch':
+      try:out=run_batch(data,lambda p,d,s:route(p,d,self.headers,s))
+      except ValueError as e:out={'success':False,'error':str(e)}
     else:
-      self.wfile.write(json.dumps({'error':'not found'}).encode())
+      try:out=route(u.path,data,self.headers)
+      except UnknownTrial as e:
+        self.send_json({'success':False,'error':str(e)},404)
+        return
+    self.send_json(out)
+  def send_json(self,out,code=200):
+    self.send_response(code)
+    self.send_header('Content-Type','application/json')
+    self.end_headers()
+    self.wfile.write(json.dumps(out).encode())
+  def send_evidence(self,sha256):
+    path=evidence_path(sha256)
+    if not path or not os.path.isfile(path):
+      self.send_json({'success':False,'error':'Unknown evidence'},404)
+      return
+    self.send_response(200)
+    self.send_header('Content-Type',evidence_content_type(sha256))
+    self.send_header('Content-Length',str(os.path.getsize(path)))
+    # Uploaded content is never rendered as part of the API origin
+    self.send_header('Content-Disposition','attachment')
+    self.send_header('X-Content-Type-Options','nosniff')
+    self.end_headers()
+    with open(path,'rb') as f:shutil.copyfileobj(f,self.wfile,CHUNK_SIZE)
 
 print(f'Starting on {PORT}')
 class ReusableTCPServer(socketserver.TCPServer):
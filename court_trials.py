@@ -0,0 +1,198 @@
+"""Compact server-side trial state.
+
+Clients used to resend the whole argument history on every call. A trial
+now lives on the server and is referenced by its trialId:
+
+  * argument and judge reasoning texts are stored once in an
+    ArgumentTable and trials only keep their integer ids - the template
+    tables are loaded first, so a template text costs 4 bytes per use;
+  * each Trial is a slotted record holding four arrays: argument ids
+    (with the side in the low bit), judge name ids, reasoning ids, and
+    fixed-width score records of [winner, plaintiff
+    logic/evidence/rebuttal/clarity, defendant ...];
+  * trial ids are random (secrets.token_urlsafe), so holding one is what
+    grants access to a trial.
+
+bench_trials.py measures the per-trial footprint with 10,000 live trials.
+"""
+import secrets
+import sys
+import threading
+import time
+from array import array
+
+JUDGES = ['PortDev', 'MikeWeb', 'Keone', 'James', 'Harpal', 'Anago']
+CRITERIA = ('logic', 'evidence', 'rebuttal', 'clarity')
+SIDES = ('plaintiff', 'defendant')
+SCORE_RECORD = 1 + 2 * len(CRITERIA)
+MAX_TRIALS = 20000
+TRIAL_ID_BYTES = 16
+
+
+def _score(scores, criterion):
+    try:
+        return max(0, min(255, int(scores.get(criterion, 0))))
+    except (AttributeError, TypeError, ValueError):
+        # OpenClaw answers don't always follow the score schema
+        return 0
+
+
+class UnknownTrial(LookupError):
+    """A request named a trialId that isn't held (never created, or evicted)"""
+
+
+class ArgumentTable:
+    """Interned argument/reasoning texts, addressed by integer id.
+
+    Texts given up front (the template tables) are kept for good; other
+    texts are reference counted and their ids reused once no live trial
+    holds them, so evicted OpenClaw arguments don't pile up.
+    """
+
+    def __init__(self, texts=()):
+        self._texts = []
+        self._ids = {}
+        self._refs = array('I')
+        self._free = []
+        self._lock = threading.Lock()
+        for text in texts:
+            self.intern(text)
+        self._pinned = len(self._texts)
+
+    def intern(self, text):
+        with self._lock:
+            arg_id = self._ids.get(text)
+            if arg_id is None:
+                text = sys.intern(text)
+                if self._free:
+                    arg_id = self._free.pop()
+                    self._texts[arg_id] = text
+                else:
+                    arg_id = len(self._texts)
+                    self._texts.append(text)
+                    self._refs.append(0)
+                self._ids[text] = arg_id
+            self._refs[arg_id] += 1
+            return arg_id
+
+    def release(self, arg_id):
+        with self._lock:
+            self._refs[arg_id] -= 1
+            if self._refs[arg_id] == 0 and arg_id >= self._pinned:
+                del self._ids[self._texts[arg_id]]
+                self._texts[arg_id] = None
+                self._free.append(arg_id)
+
+    def text(self, arg_id):
+        return self._texts[arg_id]
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class Trial:
+    __slots__ = ('trial_id', 'case_id', 'created', 'args', 'judges', 'reasonings', 'scores')
+
+    def __init__(self, trial_id, case_id=None):
+        self.trial_id = trial_id
+        self.case_id = case_id
+        self.created = time.time()
+        self.args = array('I')
+        self.judges = array('I')
+        self.reasonings = array('I')
+        self.scores = array('B')
+
+    def argument_ids(self, role):
+        side = 0 if role == 'plaintiff' else 1
+        return [packed >> 1 for packed in self.args if packed & 1 == side]
+
+    def evaluations(self):
+        """Yield (judge id, winner, plaintiff scores, defendant scores, reasoning id) per evaluation"""
+        n = len(CRITERIA)
+        for i, (judge_id, reasoning_id) in enumerate(zip(self.judges, self.reasonings)):
+            record = self.scores[i * SCORE_RECORD:(i + 1) * SCORE_RECORD]
+            yield (judge_id, SIDES[record[0]],
+                   dict(zip(CRITERIA, record[1:1 + n])),
+                   dict(zip(CRITERIA, record[1 + n:])),
+                   reasoning_id)
+
+
+class TrialStore:
+    """Live trials by id; the oldest are evicted past max_trials"""
+
+    def __init__(self, table, max_trials=MAX_TRIALS):
+        self.table = table
+        self.max_trials = max_trials
+        self._trials = {}
+        self._lock = threading.Lock()
+
+    def create(self, case_id=None):
+        trial = Trial(f"TRIAL-{secrets.token_urlsafe(TRIAL_ID_BYTES)}", case_id)
+        with self._lock:
+            self._trials[trial.trial_id] = trial
+            evicted = []
+            while len(self._trials) > self.max_trials:
+                evicted.append(self._trials.pop(next(iter(self._trials))))
+        for old in evicted:
+            for packed in old.args:
+                self.table.release(packed >> 1)
+            for text_id in old.judges + old.reasonings:
+                self.table.release(text_id)
+        return trial
+
+    def get(self, trial_id):
+        # trialId comes straight from client JSON
+        return self._trials.get(trial_id) if isinstance(trial_id, str) else None
+
+    def find(self, trial_id):
+        """The trial a request names, or None when it names none; raises UnknownTrial"""
+        if trial_id is None:
+            return None
+        trial = self.get(trial_id)
+        if trial is None:
+            raise UnknownTrial('Unknown trial')
+        return trial
+
+    def add_argument(self, trial, role, text):
+        arg_id = self.table.intern(text)
+        trial.args.append(arg_id << 1 | (0 if role == 'plaintiff' else 1))
+        return arg_id
+
+    def arguments(self, trial, role):
+        return [self.table.text(i) for i in trial.argument_ids(role)]
+
+    def add_evaluation(self, trial, judge, evaluation):
+        """Record one judge's evaluation as returned to the client.
+
+        Scores are clamped to 0-255 to fit the record; the judge, verdict
+        and reasoning are kept as given, so an OpenClaw winner is not
+        recomputed and a judge outside JUDGES keeps its name.
+        """
+        record = [1 if evaluation.get('winner') == 'defendant' else 0]
+        record += [_score(evaluation.get('plaintiff'), c) for c in CRITERIA]
+        record += [_score(evaluation.get('defendant'), c) for c in CRITERIA]
+        trial.judges.append(self.table.intern(str(judge)))
+        trial.reasonings.append(self.table.intern(str(evaluation.get('reasoning', ''))))
+        trial.scores.extend(record)
+
+    def to_json(self, trial):
+        evaluations = []
+        for judge_id, winner, p, d, reasoning_id in trial.evaluations():
+            evaluations.append({
+                'judge': self.table.text(judge_id),
+                'plaintiff': {**p, 'total': sum(p.values()) // len(CRITERIA)},
+                'defendant': {**d, 'total': sum(d.values()) // len(CRITERIA)},
+                'reasoning': self.table.text(reasoning_id),
+                'winner': winner
+            })
+        return {
+            'trialId': trial.trial_id,
+            'caseId': trial.case_id,
+            'created': trial.created,
+            'plaintiffArgs': self.arguments(trial, 'plaintiff'),
+            'defendantArgs': self.arguments(trial, 'defendant'),
+            'evaluations': evaluations
+        }
+
+    def __len__(self):
+        return len(self._trials)
@@ -0,0 +1,174 @@
+"""Near-duplicate detection for generated arguments and judge reasonings.
+
+Every emitted text is reduced to a MinHash signature over its words and
+word bigrams, and two texts are near-duplicates when their estimated
+Jaccard similarity reaches THRESHOLD. The threshold is calibrated on the
+court's own texts (see tests/test_uniqueness.py): snippet arguments that
+reuse two of their three snippets sit around 0.45, a template argument
+with a couple of words swapped around 0.8, while distinct template
+arguments and judge reasonings stay below 0.2.
+
+Signatures use one-permutation hashing: each feature is hashed once and
+lands in one of NUM_BINS bins, each bin keeps its minimum, and empty bins
+borrow their right-hand neighbour (rotation densification). Only the low
+8 bits of each bin are kept (b-bit MinHash), so a signature is NUM_BINS
+bytes. Lookups go through an LSH index of BANDS bands of BAND_ROWS bins;
+texts sharing a band are then compared on the full signature.
+
+Memory is bounded: the cross-trial index keeps the last MAX_RECENT
+signatures and per-trial history is capped at MAX_TRIALS trials of
+MAX_PER_TRIAL signatures each, evicting the least recently used.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+
+THRESHOLD = 0.3
+NUM_BINS = 128
+BAND_ROWS = 3
+BANDS = NUM_BINS // BAND_ROWS
+MAX_RECENT = 2000
+# Matches court_trials.MAX_TRIALS, so live trials keep their history
+MAX_TRIALS = 20000
+MAX_PER_TRIAL = 128
+
+_WORD = re.compile(r"[a-z0-9$%']+")
+_GOLDEN = 0x9E3779B97F4A7C15
+# Chance that two unrelated 8-bit bins are equal anyway
+_RANDOM_MATCH = 1 / 256
+
+
+def _features(text):
+    words = _WORD.findall(text.lower())
+    return set(words) | {f'{a} {b}' for a, b in zip(words, words[1:])} or {''}
+
+
+def fingerprint(text):
+    """NUM_BINS-byte MinHash signature of the lower-cased words and word bigrams in text"""
+    bins = [None] * NUM_BINS
+    for feature in _features(text):
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'big')
+        i, value = h % NUM_BINS, h // NUM_BINS
+        if bins[i] is None or value < bins[i]:
+            bins[i] = value
+    # Walk right to left so every empty bin sees the nearest filled bin on its right
+    nearest = next(i for i, v in enumerate(bins) if v is not None) + NUM_BINS
+    sig = bytearray(NUM_BINS)
+    for i in range(NUM_BINS - 1, -1, -1):
+        if bins[i] is not None:
+            nearest = i
+            sig[i] = bins[i] & 0xFF
+        else:
+            sig[i] = ((bins[nearest % NUM_BINS] + (nearest - i) * _GOLDEN) >> 32) & 0xFF
+    return bytes(sig)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    matches = (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(NUM_BINS, 'big').count(0)
+    return max(0.0, (matches / NUM_BINS - _RANDOM_MATCH) / (1 - _RANDOM_MATCH))
+
+
+def _bands(sig):
+    return [i << (8 * BAND_ROWS) | int.from_bytes(sig[i * BAND_ROWS:(i + 1) * BAND_ROWS], 'big')
+            for i in range(BANDS)]
+
+
+class UniquenessIndex:
+    """Bounded MinHash/LSH index of recently emitted texts"""
+
+    def __init__(self, max_recent=MAX_RECENT, max_trials=MAX_TRIALS, max_per_trial=MAX_PER_TRIAL,
+                 threshold=THRESHOLD):
+        self.threshold = threshold
+        self.max_recent = max_recent
+        self.max_trials = max_trials
+        self.max_per_trial = max_per_trial
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._buckets = {}
+        self._trials = OrderedDict()
+
+    def _near_recent(self, fp):
+        seen = set()
+        for band in _bands(fp):
+            bucket = self._buckets.get(band, ())
+            for other in (bucket,) if isinstance(bucket, bytes) else bucket:
+                if other not in seen:
+                    seen.add(other)
+                    if similarity(fp, other) >= self.threshold:
+                        return True
+        return False
+
+    def _near_trial(self, fp, trial_id):
+        history = self._trials.get(trial_id)
+        return bool(history) and any(similarity(fp, other) >= self.threshold for other in history)
+
+    def add(self, text, trial_id=None):
+        """Record an emitted text"""
+        fp = fingerprint(text)
+        with self._lock:
+            self._add(fp, trial_id)
+
+    def _add(self, fp, trial_id):
+        history = self._trials.pop(trial_id, None) or deque(maxlen=self.max_per_trial)
+        history.append(fp)
+        self._trials[trial_id] = history
+        while len(self._trials) > self.max_trials:
+            self._trials.popitem(last=False)
+
+        self._recent.append(fp)
+        # Most buckets hold a single signature, stored bare to keep the index small
+        for band in _bands(fp):
+            bucket = self._buckets.get(band)
+            if bucket is None:
+                self._buckets[band] = fp
+            elif isinstance(bucket, bytes):
+                self._buckets[band] = [bucket, fp]
+            else:
+                bucket.append(fp)
+        while len(self._recent) > self.max_recent:
+            old = self._recent.popleft()
+            for band in _bands(old):
+                bucket = self._buckets[band]
+                if isinstance(bucket, bytes):
+                    del self._buckets[band]
+                else:
+                    bucket.remove(old)
+                    if len(bucket) == 1:
+                        self._buckets[band] = bucket[0]
+
+    def claim(self, text, trial_id=None, cross_trial=True):
+        """Atomically check text and record it if unique; returns True when accepted"""
+        fp = fingerprint(text)
+        with self._lock:
+            if self._near_trial(fp, trial_id) or (cross_trial and self._near_recent(fp)):
+                return False
+            self._add(fp, trial_id)
+            return True
+
+    def choose(self, candidates, trial_id=None):
+        """Pick and record the first candidate that is not a near-duplicate.
+
+        Candidates unused across recent trials are preferred; small template
+        tables are exhausted quickly, so next best is anything unused within
+        this trial, and finally the first candidate so callers always get an
+        answer.
+        """
+        for cross_trial in (True, False):
+            for text in candidates:
+                if self.claim(text, trial_id, cross_trial):
+                    return text
+        self.add(candidates[0], trial_id)
+        return candidates[0]
+
+    def reset_trial(self, trial_id):
+        """Forget the per-trial history (cross-trial history is kept)"""
+        with self._lock:
+            self._trials.pop(trial_id, None)
+
+
+def trial_key(data):
+    """Trial a request belongs to: explicit trialId, else the case id, else None (shared default)"""
+    case_data = data.get('caseData') or {}
+    return data.get('trialId') or (case_data.get('case_id') if isinstance(case_data, dict) else None)
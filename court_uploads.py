@@ -0,0 +1,195 @@
+"""Streaming, size-limited request bodies and content-addressed evidence storage.
+
+Request bodies are read in CHUNK_SIZE pieces and rejected as soon as they
+exceed the route's limit, instead of trusting Content-Length and reading
+everything at once. Both Content-Length and chunked transfer encoding
+are supported.
+
+Evidence uploads are streamed straight to disk while being hashed and
+stored under data/evidence/<sha256[:2]>/<sha256>, so identical files are
+kept once. Cases only carry a small reference to the file.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+CHUNK_SIZE = 64 * 1024
+
+# Per-route request body limits in bytes
+DEFAULT_BODY_LIMIT = 64 * 1024
+BODY_LIMITS = {
+    '/api/generate-argument': 64 * 1024,
+    '/api/judge-evaluation': 256 * 1024,
+    '/api/generate-case': 16 * 1024,
+    '/api/batch': 1024 * 1024,
+    '/api/auth/moltbook': 16 * 1024,
+    '/api/auth/verify': 16 * 1024,
+}
+MAX_EVIDENCE_BYTES = 25 * 1024 * 1024
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CASES_DIR = os.path.join(BASE_DIR, 'data', 'cases')
+EVIDENCE_DIR = os.path.join(BASE_DIR, 'data', 'evidence')
+
+_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+_CASE_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+_CONTENT_TYPE = re.compile(r'^[a-z0-9][a-z0-9.+-]*/[a-z0-9][a-z0-9.+-]*$')
+_case_lock = threading.Lock()
+
+
+class BodyError(Exception):
+    """Request body rejected; status is the HTTP code to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def iter_body(handler, limit):
+    """Yield the request body in chunks, raising BodyError past limit bytes"""
+    rfile = handler.rfile
+    if handler.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+        total = 0
+        while True:
+            line = rfile.readline(1024)
+            try:
+                size = int(line.split(b';')[0].strip(), 16)
+            except ValueError:
+                raise BodyError(400, 'Malformed chunked body')
+            if size == 0:
+                # Skip trailers up to the terminating blank line
+                while rfile.readline(1024).strip():
+                    pass
+                return
+            total += size
+            if total > limit:
+                raise BodyError(413, f'Body exceeds {limit} bytes')
+            yield from _read_exact(rfile, size)
+            rfile.readline(1024)
+    else:
+        try:
+            length = int(handler.headers.get('Content-Length', 0))
+        except ValueError:
+            raise BodyError(400, 'Invalid Content-Length')
+        if length < 0:
+            raise BodyError(400, 'Invalid Content-Length')
+        if length > limit:
+            raise BodyError(413, f'Body exceeds {limit} bytes')
+        yield from _read_exact(rfile, length)
+
+
+def _read_exact(rfile, size):
+    while size:
+        piece = rfile.read(min(CHUNK_SIZE, size))
+        if not piece:
+            raise BodyError(400, 'Request body ended early')
+        size -= len(piece)
+        yield piece
+
+
+def read_body(handler, path):
+    """Read a whole (small) request body within the limit for its route"""
+    return b''.join(iter_body(handler, BODY_LIMITS.get(path, DEFAULT_BODY_LIMIT)))
+
+
+def evidence_path(sha256):
+    """On-disk location of an evidence file, or None for a malformed hash"""
+    if not _SHA256.match(sha256 or ''):
+        return None
+    return os.path.join(EVIDENCE_DIR, sha256[:2], sha256)
+
+
+def evidence_content_type(sha256):
+    """Content type recorded when the file was first uploaded"""
+    try:
+        with open(evidence_path(sha256) + '.type') as f:
+            return f.read().strip() or 'application/octet-stream'
+    except OSError:
+        return 'application/octet-stream'
+
+
+def _content_type(handler):
+    content_type = handler.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type if _CONTENT_TYPE.match(content_type) else 'application/octet-stream'
+
+
+def store_evidence(handler, query):
+    """Stream an uploaded evidence body to its content-addressed file.
+
+    query is the parsed query string: name and case_id are optional. When
+    case_id names a case under data/cases the reference is appended to its
+    evidence list. Returns the JSON response; when the case file can't be
+    updated the evidence is still stored and the response says so.
+    """
+    name = (query.get('name') or ['evidence'])[0][:200]
+    case_id = (query.get('case_id') or [None])[0]
+    if case_id and not _CASE_ID.match(case_id):
+        raise BodyError(400, 'Invalid case_id')
+
+    os.makedirs(EVIDENCE_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(dir=EVIDENCE_DIR, prefix='.upload-', delete=False)
+    try:
+        with tmp:
+            for piece in iter_body(handler, MAX_EVIDENCE_BYTES):
+                digest.update(piece)
+                tmp.write(piece)
+                size += len(piece)
+        sha256 = digest.hexdigest()
+        path = evidence_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.unlink(tmp.name)
+        else:
+            os.replace(tmp.name, path)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+        raise
+
+    content_type = _content_type(handler)
+    try:
+        # First upload of a file decides the type it is served with
+        with open(path + '.type', 'x') as f:
+            f.write(content_type)
+    except FileExistsError:
+        pass
+
+    ref = {
+        'name': name,
+        'sha256': sha256,
+        'size': size,
+        'content_type': content_type,
+    }
+    try:
+        attached = attach_evidence(case_id, ref) if case_id else False
+    except (OSError, ValueError) as e:
+        print(f"Evidence {sha256} stored but not attached to {case_id}: {e}")
+        return {'success': False, 'evidence': ref, 'case_id': case_id, 'attached': False,
+                'error': 'Evidence stored but could not be attached to the case'}
+    return {'success': True, 'evidence': ref, 'case_id': case_id, 'attached': attached}
+
+
+def attach_evidence(case_id, ref):
+    """Append an evidence reference to data/cases/<case_id>.json if that case exists"""
+    case_path = os.path.join(CASES_DIR, f'{case_id}.json')
+    with _case_lock:
+        if not os.path.isfile(case_path):
+            return False
+        with open(case_path) as f:
+            case = json.load(f)
+        evidence = case.setdefault('evidence', []) if isinstance(case, dict) else None
+        if not isinstance(evidence, list):
+            raise ValueError('case file has no evidence list')
+        if not any(isinstance(e, dict) and e.get('sha256') == ref['sha256'] for e in evidence):
+            evidence.append(ref)
+            tmp_path = case_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(case, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+            os.replace(tmp_path, case_path)
+    return True
@@ -0,0 +1,48 @@
+"""Repeat detection for generated case summaries."""
+import court_cases
+from court_cases import CaseIdAllocator, UniquenessIndex, summary_key, template_case
+
+SUMMARY = ("DeFi protocol exploit research theft in the NadLend bug bounty program: SecurityResearcher_0x3fa2 "
+           "claims the defendant copied their unpublished research, with $48213 bug bounty at stake.")
+# Same case with fresh party tags and a new amount, as template_case produces them
+RETAGGED = SUMMARY.replace('0x3fa2', '0x91ce').replace('$48213', '$72904')
+OTHER_PROTOCOL = SUMMARY.replace('NadLend', 'Kintsu')
+OTHER_CASE = ("MEV bot strategy theft allegation after the Magma mainnet launch: MEVSearcher_0a1b says the "
+              "defendant front-ran their disclosure to collect the reward, with 120 ETH in profits at stake.")
+
+
+def test_summary_key_strips_tags_and_amounts():
+    assert summary_key(SUMMARY) == summary_key(RETAGGED)
+    assert '$' not in summary_key(SUMMARY) and '3fa2' not in summary_key(SUMMARY)
+    assert summary_key('5K governance tokens and 120 ETH') == '# governance tokens and # ETH'
+
+
+def test_retagged_and_one_slot_changes_are_repeats():
+    index = UniquenessIndex(threshold=court_cases.SUMMARY_THRESHOLD)
+    assert index.claim(summary_key(SUMMARY))
+    assert not index.claim(summary_key(RETAGGED))
+    assert not index.claim(summary_key(OTHER_PROTOCOL))
+    assert index.claim(summary_key(OTHER_CASE))
+
+
+def test_generate_cases_rejects_a_retagged_repeat(monkeypatch):
+    monkeypatch.setattr(court_cases, 'SUMMARIES', UniquenessIndex(threshold=court_cases.SUMMARY_THRESHOLD))
+    ids = CaseIdAllocator()
+    cases, _ = court_cases.generate_cases(1, lambda: ({'summary': SUMMARY}, 'openclaw'), ids)
+    assert cases[0]['source'] == 'openclaw'
+    cases, _ = court_cases.generate_cases(1, lambda: ({'summary': RETAGGED}, 'openclaw'), ids)
+    assert cases[0]['source'] == 'random_fallback'
+
+
+def test_bulk_template_batches_fill(monkeypatch):
+    monkeypatch.setattr(court_cases, 'SUMMARIES', UniquenessIndex(max_recent=court_cases.RECENT_SUMMARIES,
+                                                                  threshold=court_cases.SUMMARY_THRESHOLD))
+    ids = CaseIdAllocator()
+    returned = []
+    for _ in range(4):
+        cases, dropped = court_cases.generate_cases(50, lambda: (template_case(), 'template'), ids)
+        assert len(cases) + dropped == 50
+        returned.append(len(cases))
+    assert min(returned) >= 45
+    keys = [summary_key(c['summary']) for c in cases]
+    assert len(set(keys)) == len(keys)
@@ -0,0 +1,133 @@
+"""Indexer runs against tests/fixtures/chain_rpc.json, a session in RpcClient(record_to=...) format.
+
+"initial" is the chain up to block 20 with the contract deployed at block 5;
+"reorged" is the same chain after blocks 12+ were replaced, moving the
+judgement of case 1 from block 13 to block 12 with a different verdict.
+"""
+import json
+import os
+
+import pytest
+
+from chain_indexer import ChainIndexer, EventStore, ReplayRpc, RpcError, decode_log
+
+with open(os.path.join(os.path.dirname(__file__), 'fixtures', 'chain_rpc.json')) as f:
+    FIXTURE = json.load(f)
+CONTRACT = FIXTURE['contract']
+PLAINTIFF = '0x' + '11' * 20
+DEFENDANT = '0x' + '22' * 20
+
+
+def head(calls, number):
+    """The recording with eth_blockNumber answering number"""
+    return calls + [{'method': 'eth_blockNumber', 'params': [], 'result': hex(number)}]
+
+
+def indexer(rpc, store=None, **kwargs):
+    return ChainIndexer(rpc, store or EventStore(':memory:'), CONTRACT, batch_blocks=5, parallel=2,
+                        retry_delay=0, **kwargs)
+
+
+class Flaky:
+    """Fails eth_getLogs for each range in failures that many times, then replays"""
+
+    def __init__(self, rpc, error=None, failures=None):
+        self.rpc = rpc
+        self.error = error
+        self.failures = dict(failures or {})
+        self.calls = []
+
+    def call(self, method, params):
+        if method == 'eth_getLogs':
+            span = (int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16))
+            self.calls.append(span)
+            if self.failures.get(span):
+                self.failures[span] -= 1
+                raise self.error
+        return self.rpc.call(method, params)
+
+
+def test_decode_log():
+    logs = next(c['result'] for c in FIXTURE['initial'] if c['method'] == 'eth_getLogs')
+    decoded = [decode_log(log) for log in logs]
+    assert decoded[0]['event'] == 'AgentRegistered'
+    assert decoded[0]['args'] == {'agent': PLAINTIFF, 'level': 'Reporter'}
+    # Logs with topics we don't know are skipped
+    assert decoded[2] is None
+    assert decoded[3]['args'] == {'caseId': 1, 'defendant': DEFENDANT, 'reporter': PLAINTIFF}
+    assert decoded[4]['args'] == {'caseId': 1, 'submitter': PLAINTIFF, 'isPlaintiff': True, 'round': 1}
+    assert (decoded[4]['block_number'], decoded[4]['log_index']) == (9, 0)
+
+
+def test_default_start_is_deployment_block():
+    assert indexer(ReplayRpc(FIXTURE['initial'])).start_block == FIXTURE['deployed']
+    assert indexer(ReplayRpc(FIXTURE['initial']), start_block=10).start_block == 10
+
+
+def test_sync_indexes_confirmed_blocks():
+    store = EventStore(':memory:')
+    assert indexer(ReplayRpc(FIXTURE['initial']), store).sync() == 6
+    # Head is 20, two confirmations
+    assert store.checkpoint(CONTRACT) == 18
+    state = store.case_state(1)
+    assert state['status'] == 'Judged'
+    assert (state['verdict'], state['confidence']) == ('Malicious', 80)
+    assert [a['submitter'] for a in state['arguments']] == [PLAINTIFF, DEFENDANT]
+    assert [e['event'] for e in store.agent_events(DEFENDANT)] == ['ArgumentSubmitted', 'CaseReported', 'AgentRegistered']
+
+
+def test_sync_resumes_from_checkpoint():
+    store = EventStore(':memory:')
+    assert indexer(ReplayRpc(head(FIXTURE['initial'], 11)), store).sync() == 4
+    assert store.checkpoint(CONTRACT) == 9
+    assert store.case_state(1)['status'] == 'Open'
+
+    rpc = Flaky(ReplayRpc(FIXTURE['initial']))
+    assert indexer(rpc, store).sync() == 2
+    # Only the blocks after the checkpoint were fetched
+    assert rpc.calls == [(10, 14), (15, 18)]
+    assert store.case_state(1)['status'] == 'Judged'
+    assert len(store.recent_events()) == 6
+
+
+def test_reorg_rolls_back_and_reindexes():
+    store = EventStore(':memory:')
+    indexer(ReplayRpc(FIXTURE['initial']), store).sync()
+
+    reorged = indexer(ReplayRpc(FIXTURE['reorged']), store)
+    assert reorged.check_reorg() == 11
+    assert store.checkpoint(CONTRACT) == 11
+    assert store.case_state(1)['status'] == 'Open'
+    assert reorged.check_reorg() is None
+
+    # The orphaned judgement comes back marked removed and must not be stored again
+    assert reorged.sync() == 1
+    state = store.case_state(1)
+    assert (state['verdict'], state['confidence']) == ('Spam', 60)
+    assert [e['block_number'] for e in store.case_events(1)] == [8, 9, 11, 12]
+
+
+def test_range_errors_split_the_range():
+    rpc = Flaky(ReplayRpc(head(FIXTURE['initial'], 11)), RpcError('query exceeds max block range 3'), {(5, 9): 1})
+    store = EventStore(':memory:')
+    assert indexer(rpc, store).sync() == 4
+    assert rpc.calls == [(5, 9), (5, 7), (8, 9)]
+
+
+def test_other_errors_are_retried_not_split():
+    rpc = Flaky(ReplayRpc(head(FIXTURE['initial'], 11)), RpcError('rate limit exceeded', -32005), {(5, 9): 1})
+    assert indexer(rpc).sync() == 4
+    assert rpc.calls == [(5, 9), (5, 9)]
+
+    rpc = Flaky(ReplayRpc(head(FIXTURE['initial'], 11)), OSError('connection reset'), {(5, 9): 1})
+    assert indexer(rpc).sync() == 4
+    assert rpc.calls == [(5, 9), (5, 9)]
+
+
+def test_persistent_errors_give_up_without_advancing():
+    store = EventStore(':memory:')
+    rpc = Flaky(ReplayRpc(head(FIXTURE['initial'], 11)), OSError('connection reset'), {(5, 9): 3})
+    with pytest.raises(OSError):
+        indexer(rpc, store, retries=2).sync()
+    assert rpc.calls == [(5, 9)] * 3
+    assert store.checkpoint(CONTRACT) is None
@@ -0,0 +1,38 @@
+"""Hedging and deadlines, with short Python subprocesses standing in for OpenClaw."""
+import sys
+
+from court_hedge import MIN_SAMPLES, HedgedRunner
+
+
+def sleeper(*delays):
+    """make_argv whose attempt i sleeps delays[i] seconds, then answers"""
+    return lambda attempt: [sys.executable, '-c', f"import time; time.sleep({delays[attempt]}); print('answer {attempt}')"]
+
+
+def test_warm_up_delay_leaves_room_for_a_hedge():
+    assert HedgedRunner(default_delay=8, hard_deadline=20).hedge_delay() == 8
+    assert HedgedRunner(default_delay=8, hard_deadline=4).hedge_delay() == 2
+
+
+def test_hedge_wins_when_deadline_is_below_default_delay():
+    runner = HedgedRunner(default_delay=8, hard_deadline=1.0)
+    assert runner.run(sleeper(30, 0)) == 'answer 1\n'
+    stats = runner.stats()
+    assert (stats['hedged'], stats['hedge_wins']) == (1, 1)
+
+
+def test_deadline_kills_attempts_and_samples_them_censored():
+    runner = HedgedRunner(default_delay=0.2, hard_deadline=0.6)
+    assert runner.run(sleeper(30, 30)) is None
+    stats = runner.stats()
+    assert stats['deadline_fallbacks'] == 1
+    # Primary and hedge both count, at what they had run by the deadline
+    assert stats['latency_samples'] == 2
+    assert 0.35 <= min(runner._latencies) <= max(runner._latencies) <= 0.65
+
+
+def test_timeouts_raise_the_hedge_delay():
+    runner = HedgedRunner(percentile=50, default_delay=1, hard_deadline=10)
+    runner._latencies.extend([0.5] * (MIN_SAMPLES // 2) + [10] * (MIN_SAMPLES // 2 + 1))
+    # Delay is capped at half the hard deadline so a hedge still has time
+    assert runner.hedge_delay() == 5
@@ -0,0 +1,45 @@
+"""Server-side trial records."""
+import pytest
+
+from court_trials import JUDGES, ArgumentTable, TrialStore, UnknownTrial
+
+
+def evaluation(winner='plaintiff', reasoning='Timestamps settle it.'):
+    return {'plaintiff': {'logic': 90, 'evidence': 80, 'rebuttal': 70, 'clarity': 60},
+            'defendant': {'logic': 50, 'evidence': 50, 'rebuttal': 50, 'clarity': 50},
+            'reasoning': reasoning, 'winner': winner}
+
+
+def test_trial_ids_are_random_tokens():
+    store = TrialStore(ArgumentTable())
+    ids = [store.create().trial_id for _ in range(3)]
+    assert len(set(ids)) == 3
+    # No shared timestamp or node prefix to guess neighbours from
+    assert all(len(i) >= len('TRIAL-') + 20 for i in ids)
+    assert len({i[:12] for i in ids}) == 3
+
+
+def test_evaluations_round_trip_with_their_judge():
+    store = TrialStore(ArgumentTable(JUDGES))
+    trial = store.create('CASE-1')
+    store.add_evaluation(trial, 'Keone', evaluation())
+    store.add_evaluation(trial, 'GuestJudge', evaluation('defendant', 'Not proven.'))
+    out = store.to_json(store.find(trial.trial_id))['evaluations']
+    assert [(e['judge'], e['winner'], e['reasoning']) for e in out] == [
+        ('Keone', 'plaintiff', 'Timestamps settle it.'),
+        ('GuestJudge', 'defendant', 'Not proven.'),
+    ]
+    assert out[0]['plaintiff'] == {'logic': 90, 'evidence': 80, 'rebuttal': 70, 'clarity': 60, 'total': 75}
+
+
+def test_eviction_releases_judges_and_texts():
+    table = ArgumentTable(JUDGES)
+    store = TrialStore(table, max_trials=1)
+    trial = store.create()
+    store.add_argument(trial, 'plaintiff', 'My client found it first.')
+    store.add_evaluation(trial, 'GuestJudge', evaluation())
+    assert len(table) == len(JUDGES) + 3
+    store.create()
+    assert len(table) == len(JUDGES)
+    with pytest.raises(UnknownTrial):
+        store.find(trial.trial_id)
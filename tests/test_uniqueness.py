@@ -0,0 +1,105 @@
+"""Near-duplicate threshold checks on texts the servers actually emit."""
+from court_uniqueness import UniquenessIndex, fingerprint, similarity, trial_key
+
+# backend_server PLAINTIFF_SNIPPETS, composed the way compose_argument does for round 1
+SNIPPET_ARG = "Your Honor, my client documented blockchain proof from March 15th. defendant has FOUR attribution disputes."
+SNIPPET_ARG_SAME_TWO = "Your Honor, my client documented blockchain proof from March 15th. pattern of wait, copy, claim bounty."
+SNIPPET_ARG_SAME_ONE = "The evidence is devastating: private repo access at 16:47 UTC. defendant has FOUR attribution disputes."
+
+# court_server PLAINTIFF_ARGUMENTS
+CLOSING = (
+    "In closing: timestamps don't lie, blockchain doesn't lie, and the technical evidence doesn't lie. "
+    "My client discovered this vulnerability through months of dedicated research. The defendant stole it "
+    "in hours. This Court must award attribution to Bitlover082, order full restitution, and send an "
+    "unequivocal message that intellectual property theft has consequences in our ecosystem."
+)
+CLOSING_EDITED = CLOSING.replace('Bitlover082', 'the plaintiff').replace('hours', 'minutes')
+EXHIBIT = (
+    "Exhibit P-2 demonstrates the defendant accessed our private security repository at 16:47 UTC—mere "
+    "hours after our confidential disclosure. Their subsequent publication at 19:12 UTC reveals they read "
+    "our research and claimed credit. This isn't research; it's industrial espionage."
+)
+
+# court_server JR['Keone']['P']
+REASONING_A = (
+    "The blockchain never lies, and the data here is unequivocal. Transaction timestamps on the Monad network "
+    "definitively prove the plaintiff's prior discovery. The immutable record shows disclosure timing that "
+    "predates the defendant's claims by significant margins. This on-chain evidence is the bedrock of my decision."
+)
+REASONING_B = (
+    "I've verified the on-chain proofs myself. The transaction hashes confirm the plaintiff's timeline beyond "
+    "any doubt. Smart contract interactions demonstrate their early engagement with this vulnerability. The "
+    "defendant's timeline simply cannot compete with cryptographic truth."
+)
+
+NEAR_DUPLICATES = [
+    (SNIPPET_ARG, SNIPPET_ARG),
+    (SNIPPET_ARG, SNIPPET_ARG_SAME_TWO),
+    (CLOSING, CLOSING_EDITED),
+]
+DISTINCT = [
+    (SNIPPET_ARG, SNIPPET_ARG_SAME_ONE),
+    (CLOSING, EXHIBIT),
+    (REASONING_A, REASONING_B),
+    (SNIPPET_ARG, REASONING_A),
+]
+
+
+def test_near_duplicates_are_rejected_across_trials():
+    for first, second in NEAR_DUPLICATES:
+        index = UniquenessIndex()
+        assert index.claim(first, 'trial-1')
+        assert not index.claim(second, 'trial-2'), (first, second)
+
+
+def test_distinct_texts_are_accepted_within_a_trial():
+    for first, second in DISTINCT:
+        index = UniquenessIndex()
+        assert index.claim(first, 'trial-1')
+        assert index.claim(second, 'trial-1'), (first, second)
+
+
+def test_similarity_tracks_jaccard():
+    assert similarity(fingerprint(CLOSING), fingerprint(CLOSING)) == 1.0
+    assert similarity(fingerprint(CLOSING), fingerprint(CLOSING_EDITED)) > 0.6
+    assert similarity(fingerprint(CLOSING), fingerprint(EXHIBIT)) < 0.2
+
+
+def test_trial_only_check_ignores_other_trials():
+    index = UniquenessIndex()
+    assert index.claim(CLOSING, 'trial-1')
+    assert not index.claim(CLOSING_EDITED, 'trial-2')
+    assert index.claim(CLOSING_EDITED, 'trial-2', cross_trial=False)
+    assert not index.claim(CLOSING, 'trial-2', cross_trial=False)
+
+
+def test_recent_window_is_bounded():
+    index = UniquenessIndex(max_recent=2)
+    index.add(CLOSING, 'a')
+    index.add(EXHIBIT, 'b')
+    index.add(REASONING_A, 'c')
+    # CLOSING has aged out of the cross-trial window
+    assert index.claim(CLOSING_EDITED, 'd')
+    assert not index.claim(REASONING_A, 'd')
+
+
+def test_trial_history_is_evicted_least_recently_used():
+    index = UniquenessIndex(max_recent=1, max_trials=2)
+    index.add(CLOSING, 'a')
+    index.add(EXHIBIT, 'b')
+    index.add(REASONING_A, 'c')
+    assert not index.claim(EXHIBIT, 'b', cross_trial=False)
+    assert index.claim(CLOSING_EDITED, 'a', cross_trial=False)
+
+
+def test_choose_prefers_unused_and_always_answers():
+    index = UniquenessIndex()
+    index.add(CLOSING, 'trial-1')
+    assert index.choose([CLOSING_EDITED, EXHIBIT], 'trial-1') == EXHIBIT
+    assert index.choose([CLOSING, EXHIBIT], 'trial-1') == CLOSING
+
+
+def test_trial_key():
+    assert trial_key({'trialId': 'T-1', 'caseData': {'case_id': 'C-1'}}) == 'T-1'
+    assert trial_key({'caseData': {'case_id': 'C-1'}}) == 'C-1'
+    assert trial_key({'caseData': 'not a dict'}) is None